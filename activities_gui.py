@@ -7,18 +7,16 @@ start tasks and processes.
 
 import tkinter as tk
 from tkinter import ttk
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from gamestate import GameState
+from timeline import TimeState
 from gamedefs import (
-    get_activity_names,
-    get_activity_description,
-    get_activity_requirements,
-    get_activity_by_displayname,
-    format_requirements,
-    format_consumed_produced,
+    ActivityDef,
+    get_activity_detail_text,
     make_activity_task,
-    get_unlocked_activities
+    get_unlocked_activities,
+    NO_REQUIREMENTS_TEXT
 )
 from variable import LinearVariable
 
@@ -33,6 +31,9 @@ class ActivitiesScreen(ttk.Frame):
         super().__init__(parent)
         self.gamestate = gamestate
         self.app = app
+        # Availability results for the current (time bucket, TimeState, timeline version)
+        self._can_start_cache: Dict[str, bool] = {}
+        self._can_start_cache_key: Optional[Tuple[int, TimeState, int]] = None
 
         self._create_widgets()
 
@@ -66,7 +67,12 @@ class ActivitiesScreen(ttk.Frame):
         activities_scroll.grid(row=0, column=1, sticky="ns")
         self.activities_list.configure(yscrollcommand=activities_scroll.set)
 
-        self._displayed_activities = []
+        self._displayed_activities: Tuple[str, ...] = ()
+        self._displayed_activity_defs: List[ActivityDef] = []  # Parallel to the rows
+        # State and registry version the rows were last built from
+        self._unlocked_ts: Optional[TimeState] = None
+        self._unlocked_version = -1
+        self._row_state: List[Tuple[str, str]] = []  # (displayname, foreground) per row
 
         # Start button
         start_btn = ttk.Button(available_frame, text="Start Activity",
@@ -93,86 +99,75 @@ class ActivitiesScreen(ttk.Frame):
         req_frame = ttk.LabelFrame(details_frame, text="Requirements", padding=5)
         req_frame.grid(row=2, column=0, sticky="ew", pady=(10, 0))
 
-        self.requirements_label = ttk.Label(req_frame, text="None",
+        self.requirements_label = ttk.Label(req_frame, text=NO_REQUIREMENTS_TEXT,
                                             foreground="gray")
         self.requirements_label.grid(row=0, column=0, sticky="w")
+        self._requirements_text = NO_REQUIREMENTS_TEXT  # Text currently shown in the label
 
         # Bind selection event
         self.activities_list.bind("<<ListboxSelect>>", self._on_select)
 
-    def _on_select(self, event):
-        """Handle activity selection."""
+    def _selected_activity(self) -> Optional[ActivityDef]:
+        """Get the activity definition for the selected row, if any."""
         selection = self.activities_list.curselection()
-        if not selection:
-            return
+        if not selection or selection[0] >= len(self._displayed_activity_defs):
+            return None
+        return self._displayed_activity_defs[selection[0]]
 
-        activity_name = self.activities_list.get(selection[0])
-        activity = get_activity_by_displayname(activity_name)
+    def _on_select(self, event):
+        """Handle activity selection."""
+        activity = self._selected_activity()
         if not activity:
             return
 
-        self.details_header.configure(text=activity["displayname"])
+        self.details_header.configure(text=activity.displayname)
 
-        # Update details with description and resource effects
+        # Update details with description, duration and resource effects
         self.details_text.configure(state="normal")
         self.details_text.delete("1.0", tk.END)
-
-        description = get_activity_description(activity_name)
-        resource_effects = format_consumed_produced(activity)
-
-        # Add duration estimate
-        rate = activity.get("rate", 10)
-        duration = 100 / rate if rate > 0 else float('inf')
-
-        full_text = f"{description}\n\n"
-        full_text += f"Duration: ~{duration:.1f} time units\n\n"
-        full_text += f"{resource_effects}"
-
-        self.details_text.insert("1.0", full_text)
+        self.details_text.insert("1.0", get_activity_detail_text(activity.displayname))
         self.details_text.configure(state="disabled")
 
-        # Update requirements
-        reqs = get_activity_requirements(activity_name)
-        self.requirements_label.configure(text=format_requirements(reqs))
+        # Update requirements, skipping the Tk call when the text is unchanged
+        requirements_text = activity.requirements_text
+        if requirements_text != self._requirements_text:
+            self.requirements_label.configure(text=requirements_text)
+            self._requirements_text = requirements_text
 
     def _start_activity(self):
         """Start the selected activity as a Task on the timeline."""
-        selection = self.activities_list.curselection()
-        if not selection:
+        activity = self._selected_activity()
+        if not activity:
             return
 
-        activity_name = self.activities_list.get(selection[0])
+        activity_name = activity.displayname
+        current_time = self.app.current_time
+        ts = self.gamestate.timeline.state_at(current_time)
 
         # Check if requirements are met
-        if not self._can_start_activity(activity_name):
+        if not self._can_start_activity(activity, ts):
             print(f"Cannot start {activity_name}: requirements not met")
             return
 
         # Create the task at the current time
-        current_time = self.app.current_time
-        ts = self.gamestate.timeline.state_at(current_time)
         task = make_activity_task(activity_name, current_time, ts)
 
         if task:
             # Add the task to the timeline
             self.gamestate.timeline.add_event(task)
             print(f"Started activity: {activity_name} at t={current_time}")
-            # Display updates automatically on next update loop
+            # Display updates on the next update loop
+            self.app.mark_dirty()
         else:
             print(f"Failed to create task for: {activity_name}")
 
-    def _can_start_activity(self, activity_name: str) -> bool:
-        """Check if an activity can be started based on current resources."""
-        activity = get_activity_by_displayname(activity_name)
-        if not activity:
-            return False
-
-        requirements = activity.get("requirements", {})
+    def _can_start_activity(self, activity: ActivityDef, ts: TimeState) -> bool:
+        """Check if an activity can be started based on resources in ts at the current time."""
+        requirements = activity.requirements
         current_time = self.app.current_time
-        ts = self.gamestate.timeline.state_at(current_time)
 
         # Check requirements
-        for var_name, amount in requirements.items():
+        for var_name, amount in requirements:
             var = ts.get_variable(var_name)
             if not var:
                 return False
@@ -184,7 +179,7 @@ class ActivitiesScreen(ttk.Frame):
                     return False
 
         # Check that the task isn't already running (uniqueness)
-        internal_name = activity.get("name", "")
+        internal_name = activity.name
         if ts.get_variable(internal_name + "_progress"):
             return False
 
@@ -193,34 +188,64 @@ class ActivitiesScreen(ttk.Frame):
     def update_display(self, current_time: float):
         """Update the activities display based on what's unlocked at current time."""
         ts = self.gamestate.timeline.state_at(current_time)
- 
-        # Get currently unlocked activities (time-aware)
-        unlocked = get_unlocked_activities(ts)
-        unlocked_names = [a["displayname"] for a in unlocked]
- 
-        # Only refresh list if the set of unlocked activities changed
-        if unlocked_names != self._displayed_activities:
-            # Remember current selection
-            selection = self.activities_list.curselection()
-            selected_name = None
-            if selection:
-                selected_name = self.activities_list.get(selection[0])
- 
-            # Rebuild the list
-            self.activities_list.delete(0, tk.END)
-            for name in unlocked_names:
-                self.activities_list.insert(tk.END, name)
-            self._displayed_activities = unlocked_names
- 
-            # Restore selection if the activity is still in the list
-            if selected_name and selected_name in unlocked_names:
-                idx = unlocked_names.index(selected_name)
-                self.activities_list.selection_set(idx)
- 
-        # Update each activity's availability status (can start vs locked)
-        for i in range(self.activities_list.size()):
-            activity_name = self.activities_list.get(i)
-            if self._can_start_activity(activity_name):
-                self.activities_list.itemconfig(i, fg="black")
-            else:
-                self.activities_list.itemconfig(i, fg="gray")
+        rows_changed = False
+
+        # Unlocks are stored as variables in the state, so the list can only
+        # change when we move to another state or variables are added/removed
+        if ts is not self._unlocked_ts or ts.registry.version != self._unlocked_version:
+            self._unlocked_ts = ts
+            self._unlocked_version = ts.registry.version
+            # Get currently unlocked activities (time-aware)
+            unlocked = get_unlocked_activities(ts)
+            unlocked_names = tuple(a.displayname for a in unlocked)
+
+            # Patch only the rows that changed rather than rebuilding the list.
+            # Rows are compared from both ends; everything between the common
+            # prefix and suffix is replaced. Untouched rows keep their selection.
+            if unlocked_names != self._displayed_activities:
+                old = self._displayed_activities
+                prefix = 0
+                limit = min(len(old), len(unlocked_names))
+                while prefix < limit and old[prefix] == unlocked_names[prefix]:
+                    prefix += 1
+                suffix = 0
+                limit -= prefix
+                while suffix < limit and old[-1 - suffix] == unlocked_names[-1 - suffix]:
+                    suffix += 1
+
+                old_end = len(old) - suffix
+                new_end = len(unlocked_names) - suffix
+                if old_end > prefix:
+                    self.activities_list.delete(prefix, old_end - 1)
+                if new_end > prefix:
+                    self.activities_list.insert(prefix, *unlocked_names[prefix:new_end])
+
+                # Inserted rows start with the default foreground
+                self._row_state[prefix:old_end] = [
+                    (name, "") for name in unlocked_names[prefix:new_end]
+                ]
+                self._displayed_activities = unlocked_names
+                self._displayed_activity_defs = unlocked
+                rows_changed = True
+
+        # Availability only changes with time, the state in effect or timeline
+        # edits, so reuse results while none of those has moved on
+        cache_key = (int(current_time * 10), ts, self.gamestate.timeline.version)
+        if cache_key != self._can_start_cache_key:
+            self._can_start_cache.clear()
+            self._can_start_cache_key = cache_key
+        elif not rows_changed:
+            return  # Every row's colour is already up to date
+        cache = self._can_start_cache
+
+        # Update each activity's availability status (can start vs locked),
+        # touching Tk only for rows whose colour actually changed
+        for i, activity in enumerate(self._displayed_activity_defs):
+            activity_name, shown_fg = self._row_state[i]
+            can_start = cache.get(activity_name)
+            if can_start is None:
+                can_start = cache[activity_name] = self._can_start_activity(activity, ts)
+            fg = "black" if can_start else "gray"
+            if fg != shown_fg:
+                self.activities_list.itemconfig(i, fg=fg)
+                self._row_state[i] = (activity_name, fg)
@@ -5,6 +5,7 @@ This module creates the main application window and coordinates all GUI componen
 Uses tkinter for the interface.
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional
@@ -12,6 +13,13 @@ from typing import Optional
 from gamestate import GameState
 from timeline import TimeState, Timeline
 from variable import Variable, LinearVariable
+from panel_gui import ResourcePanel
+from timeline_gui import TimelinePanel
+from tabbed_menu_gui import TabbedMenu
+
+# Shortest gap between GUI refreshes (about 60 per second). Scrubbing can
+# request refreshes far faster than the screen can show them.
+MIN_REFRESH_INTERVAL = 1 / 60
 
 
 class TimescrubberApp:
@@ -22,6 +30,9 @@ class TimescrubberApp:
         self.current_time = 0.0
         self.time_scale = 1.0  # How fast time passes (1.0 = real-time)
         self.paused = True
+        self._tick_job = None  # Pending time-advance timer, only armed while unpaused
+        self._refresh_pending = False  # A GUI refresh is queued
+        self._last_refresh = float("-inf")  # time.monotonic() of the last refresh
 
         # Create main window
         self.root = tk.Tk()
@@ -40,11 +51,6 @@ class TimescrubberApp:
 
     def _create_widgets(self):
         """Create all GUI widgets."""
-        # Import GUI components here to avoid circular imports
-        from panel_gui import ResourcePanel
-        from timeline_gui import TimelinePanel
-        from tabbed_menu_gui import TabbedMenu
-
         # Left side panel (resources and active tasks)
         self.side_panel = ResourcePanel(self.root, self.gamestate, self)
         self.side_panel.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
@@ -58,34 +64,68 @@ class TimescrubberApp:
         self.timeline_panel.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
 
     def _start_update_loop(self):
-        """Start the periodic update loop."""
-        self._update()
-
-    def _update(self):
-        """Update the game state and GUI periodically."""
+        """Draw the initial state and start advancing time if unpaused."""
+        self.mark_dirty()
         if not self.paused:
-            # Advance time
-            self.current_time += 0.1 * self.time_scale
+            self._schedule_tick()
+
+    def _schedule_tick(self):
+        """Arm the time-advance timer (100ms = 10 ticks per second)."""
+        self._tick_job = self.root.after(100, self._advance_time)
+
+    def _advance_time(self):
+        """Advance game time by one tick while unpaused."""
+        self._tick_job = None
+        if self.paused:
+            return
+
+        self.current_time += 0.1 * self.time_scale
+
+        # Extend max_time if needed
+        if self.current_time > self.gamestate.timeline.max_time - 10:
+            self.gamestate.timeline.change_max_time(self.current_time + 100)
 
-            # Extend max_time if needed
-            if self.current_time > self.gamestate.timeline.max_time - 10:
-                self.gamestate.timeline.change_max_time(self.current_time + 100)
+        self.mark_dirty()
+        self._schedule_tick()
 
-        # Update all panels
+    def _refresh_gui(self):
+        """Update all panels once for any number of coalesced requests."""
+        self._refresh_pending = False
+        self._last_refresh = time.monotonic()
         self.side_panel.update_display(self.current_time)
         self.timeline_panel.update_display(self.current_time)
         self.main_content.update_display(self.current_time)
 
-        # Schedule next update (100ms = 10 updates per second)
-        self.root.after(100, self._update)
+    def mark_dirty(self):
+        """Request a GUI refresh when Tk is next idle.
+
+        Requests made before that refresh runs are merged into it. Refreshes
+        are at least MIN_REFRESH_INTERVAL apart; a request that comes sooner
+        is deferred, not dropped, so the final state is always drawn.
+        """
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            wait = self._last_refresh + MIN_REFRESH_INTERVAL - time.monotonic()
+            if wait > 0:
+                self.root.after(int(wait * 1000) + 1, self._refresh_gui)
+            else:
+                self.root.after_idle(self._refresh_gui)
 
     def toggle_pause(self):
-        """Toggle pause state."""
+        """Toggle pause state, starting or stopping the time loop."""
         self.paused = not self.paused
+        if self.paused:
+            if self._tick_job is not None:
+                self.root.after_cancel(self._tick_job)
+                self._tick_job = None
+        elif self._tick_job is None:
+            self._schedule_tick()
+        self.mark_dirty()
 
     def set_time(self, t: float):
         """Set the current time (for timeline scrubbing)."""
         self.current_time = max(0, t)
+        self.mark_dirty()
 
     def run(self):
         """Start the main event loop."""
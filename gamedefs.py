@@ -4,8 +4,13 @@
 # screens, settings, upgrades, etc. GUI code should import from here rather than
 # defining content inline.
 
-from typing import Dict, List, Any, Optional
+import sys
+from types import MappingProxyType
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Any, Mapping, Optional, Sequence, Tuple, Union
 
+from timeline import Task
 from upgrades import (
     UpgradeType, UpgradeDefinition, make_upgrade,
     make_rate_modifier_effect, make_consumed_modifier_effect,
@@ -17,244 +22,332 @@ from upgrades import (
 # ACTIVITY DEFINITIONS
 # =============================================================================
 
-# Each activity has:
-# - name: Internal name (used for uniqueness)
-# - displayname: Display name shown to player
-# - description: Full description text
-# - rate: Progress rate (100/rate = time to complete)
-# - consumed: List of (resource_name, rate) tuples for resources consumed over time
-# - produced: List of (resource_name, rate) tuples for resources produced over time
-# - on_complete_give: Dict of resource_name -> amount given on completion
-# - requirements: Dict of resource_name -> minimum amount needed to start
-# - tags: List of category tags for modifier targeting
-# - unlocked: Whether visible by default (False = requires unlock)
-
-ACTIVITIES: List[Dict[str, Any]] = [
-    {
-        "name": "rest",
-        "displayname": "Rest",
-        "description": (
+@dataclass(frozen=True, slots=True)
+class ActivityDef:
+    """Static definition of an activity the player can start.
+
+    Attributes:
+        name: Internal name (used for uniqueness)
+        displayname: Display name shown to player
+        description: Full description text
+        rate: Progress rate (100/rate = time to complete)
+        consumed: (resource_name, rate) pairs for resources consumed over time. Stored
+            as a tuple with repeated resources summed into one entry
+        produced: (resource_name, rate) pairs for resources produced over time, stored
+            the same way as consumed
+        on_complete_give: (resource_name, amount) pairs given on completion. Given as a
+            dict and stored as a tuple in definition order, like requirements
+        requirements: (resource_name, minimum amount) pairs needed to start. Given as a
+            dict and stored as a tuple in definition order, so the definition is hashable
+        tags: Category tags for modifier targeting, given as any iterable and stored
+            as a frozenset
+        unlocked: Whether visible by default (False = requires unlock)
+        requirements_text: Formatted requirements, derived on construction
+        consumed_text: Formatted consumed rates ("" if none), derived on construction
+        produced_text: Formatted produced rates ("" if none), derived on construction
+        on_complete_text: Formatted completion rewards ("" if none), derived on construction
+        effects_text: Formatted resource effects, joined from the three parts above
+        unlock_var_name: TimeState variable recording that this activity was unlocked
+    """
+    name: str
+    displayname: str
+    description: str
+    rate: float
+    consumed: Sequence[Tuple[str, float]]
+    produced: Sequence[Tuple[str, float]]
+    on_complete_give: Union[Mapping[str, float], Tuple[Tuple[str, float], ...]]
+    requirements: Union[Mapping[str, float], Tuple[Tuple[str, float], ...]]
+    tags: Iterable[str]
+    unlocked: bool = True
+    requirements_text: str = field(init=False, repr=False, compare=False)
+    consumed_text: str = field(init=False, repr=False, compare=False)
+    produced_text: str = field(init=False, repr=False, compare=False)
+    on_complete_text: str = field(init=False, repr=False, compare=False)
+    effects_text: str = field(init=False, repr=False, compare=False)
+    unlock_var_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Pre-sum rates so each resource is touched once when the task starts/ends
+        object.__setattr__(self, "consumed", _sum_rates(self.consumed))
+        object.__setattr__(self, "produced", _sum_rates(self.produced))
+
+        # Intern resource names so registry lookups hit the identity fast path
+        object.__setattr__(self, "on_complete_give",
+                           tuple((sys.intern(k), v) for k, v in dict(self.on_complete_give).items()))
+        object.__setattr__(self, "requirements",
+                           tuple((sys.intern(k), v) for k, v in dict(self.requirements).items()))
+        # Modifiers test tag membership for every task, so make that a hash lookup
+        object.__setattr__(self, "tags", frozenset(self.tags))
+
+        # Display strings only depend on the static fields, so format them once
+        object.__setattr__(self, "requirements_text",
+                           sys.intern(format_requirements(self.requirements)))
+        object.__setattr__(self, "consumed_text", _format_rates(self.consumed, "-"))
+        object.__setattr__(self, "produced_text", _format_rates(self.produced, "+"))
+        object.__setattr__(self, "on_complete_text", _format_on_complete(self.on_complete_give))
+        object.__setattr__(self, "effects_text", format_consumed_produced(self))
+        object.__setattr__(self, "unlock_var_name", sys.intern(f"task_unlocked_{self.name}"))
+
+
+def _sum_rates(rates) -> Tuple[Tuple[str, float], ...]:
+    """Merge (resource_name, rate) pairs naming the same resource, keeping first-seen order."""
+    totals: Dict[str, float] = {}
+    for name, rate in rates:
+        name = sys.intern(name)
+        totals[name] = totals.get(name, 0) + rate
+    return tuple(totals.items())
+
+
+# Shared text for activities without requirements
+NO_REQUIREMENTS_TEXT = sys.intern("None")
+
+
+def format_requirements(requirements) -> str:
+    """Format (resource_name, amount) requirement pairs as display string."""
+    if not requirements:
+        return NO_REQUIREMENTS_TEXT
+    return ", ".join(["%s: %s" % item for item in requirements])
+
+
+def _format_rates(rates, sign: str) -> str:
+    """Format (resource_name, rate) pairs as e.g. "-1 Wood/t, -0.5 Stone/t"."""
+    return ", ".join(["%s%s %s/t" % (sign, rate, name) for name, rate in rates])
+
+
+def _format_on_complete(on_complete) -> str:
+    """Format (resource_name, amount) completion rewards/costs, skipping zero amounts."""
+    return ", ".join(["+%s %s" % (amt, res) if amt > 0 else "%s %s" % (amt, res)
+                      for res, amt in on_complete if amt])
+
+
+def format_consumed_produced(activity: "ActivityDef") -> str:
+    """Format consumed and produced resources as display string.
+
+    Joins the per-part strings precomputed on the ActivityDef.
+    """
+    parts = []
+    if activity.consumed_text:
+        parts.append("Consumes: " + activity.consumed_text)
+    if activity.produced_text:
+        parts.append("Produces: " + activity.produced_text)
+    if activity.on_complete_text:
+        parts.append("On complete: " + activity.on_complete_text)
+
+    return "\n".join(parts) if parts else "No resource effects"
+
+
+
+ACTIVITIES: Tuple[ActivityDef, ...] = (
+    ActivityDef(
+        name="rest",
+        displayname="Rest",
+        description=(
             "Take a break and recover your stamina. "
             "Stamina is essential for performing most activities. "
             "Resting accelerates stamina recovery."
         ),
-        "rate": 20,  # 5 time units to complete
-        "consumed": [],
-        "produced": [("Stamina", 1)],  # Extra +1 stamina/time while resting
-        "on_complete_give": {},
-        "requirements": {},
-        "tags": ["rest", "recovery"],
-        "unlocked": True,
-    },
-    {
-        "name": "gather_wood",
-        "displayname": "Gather Wood",
-        "description": (
+        rate=20,  # 5 time units to complete
+        consumed=[],
+        produced=[("Stamina", 1)],  # Extra +1 stamina/time while resting
+        on_complete_give={},
+        requirements={},
+        tags=["rest", "recovery"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="gather_wood",
+        displayname="Gather Wood",
+        description=(
             "Collect wood from nearby trees. "
             "Wood is a basic resource used in many crafting recipes."
         ),
-        "rate": 10,  # 10 time units to complete
-        "consumed": [("Stamina", 0.5)],  # Consumes 0.5 stamina per time
-        "produced": [],
-        "on_complete_give": {"Wood": 5},  # Get 5 wood on completion
-        "requirements": {"Stamina": 2},
-        "tags": ["gathering", "wood", "basic"],
-        "unlocked": True,
-    },
-    {
-        "name": "gather_stone",
-        "displayname": "Gather Stone",
-        "description": (
+        rate=10,  # 10 time units to complete
+        consumed=[("Stamina", 0.5)],  # Consumes 0.5 stamina per time
+        produced=[],
+        on_complete_give={"Wood": 5},  # Get 5 wood on completion
+        requirements={"Stamina": 2},
+        tags=["gathering", "wood", "basic"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="gather_stone",
+        displayname="Gather Stone",
+        description=(
             "Search for and collect stone. "
             "Stone is needed for tools and building structures."
         ),
-        "rate": 8,  # 12.5 time units to complete
-        "consumed": [("Stamina", 0.6)],
-        "produced": [],
-        "on_complete_give": {"Stone": 3},
-        "requirements": {"Stamina": 3},
-        "tags": ["gathering", "stone", "basic"],
-        "unlocked": True,
-    },
-    {
-        "name": "craft_tools",
-        "displayname": "Craft Basic Tools",
-        "description": (
+        rate=8,  # 12.5 time units to complete
+        consumed=[("Stamina", 0.6)],
+        produced=[],
+        on_complete_give={"Stone": 3},
+        requirements={"Stamina": 3},
+        tags=["gathering", "stone", "basic"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="craft_tools",
+        displayname="Craft Basic Tools",
+        description=(
             "Create simple tools to improve efficiency. "
             "Tools make gathering and building faster."
         ),
-        "rate": 5,  # 20 time units to complete
-        "consumed": [("Stamina", 0.2)],
-        "produced": [],
-        "on_complete_give": {"Wood": -5, "Stone": -2},  # Consumes materials on completion
-        "requirements": {"Wood": 5, "Stone": 2},
-        "tags": ["crafting", "tools"],
-        "unlocked": True,
-    },
-    {
-        "name": "build_shelter",
-        "displayname": "Build Shelter",
-        "description": (
+        rate=5,  # 20 time units to complete
+        consumed=[("Stamina", 0.2)],
+        produced=[],
+        on_complete_give={"Wood": -5, "Stone": -2},  # Consumes materials on completion
+        requirements={"Wood": 5, "Stone": 2},
+        tags=["crafting", "tools"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="build_shelter",
+        displayname="Build Shelter",
+        description=(
             "Construct a basic shelter for protection. "
             "Shelters provide bonuses to resting and storage."
         ),
-        "rate": 2,  # 50 time units to complete
-        "consumed": [("Stamina", 0.3)],
-        "produced": [],
-        "on_complete_give": {"Wood": -20, "Stone": -10},
-        "requirements": {"Wood": 20, "Stone": 10},
-        "tags": ["construction", "building", "shelter"],
-        "unlocked": True,
-    },
-    {
-        "name": "explore",
-        "displayname": "Explore Area",
-        "description": (
+        rate=2,  # 50 time units to complete
+        consumed=[("Stamina", 0.3)],
+        produced=[],
+        on_complete_give={"Wood": -20, "Stone": -10},
+        requirements={"Wood": 20, "Stone": 10},
+        tags=["construction", "building", "shelter"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="explore",
+        displayname="Explore Area",
+        description=(
             "Scout the surrounding area to discover new locations "
             "and resources."
         ),
-        "rate": 5,  # 20 time units
-        "consumed": [("Stamina", 0.4)],
-        "produced": [],
-        "on_complete_give": {"Insights": 2},
-        "requirements": {"Stamina": 5},
-        "tags": ["exploration", "discovery"],
-        "unlocked": True,
-    },
-    {
-        "name": "meditate",
-        "displayname": "Meditate",
-        "description": (
+        rate=5,  # 20 time units
+        consumed=[("Stamina", 0.4)],
+        produced=[],
+        on_complete_give={"Insights": 2},
+        requirements={"Stamina": 5},
+        tags=["exploration", "discovery"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="meditate",
+        displayname="Meditate",
+        description=(
             "Quiet contemplation to gain insights. "
             "Insights are used for research and upgrades."
         ),
-        "rate": 10,  # 10 time units
-        "consumed": [("Stamina", 0.1)],
-        "produced": [("Insights", 0.2)],  # Produces insights over time
-        "on_complete_give": {},
-        "requirements": {"Stamina": 1},
-        "tags": ["mental", "insights", "meditation"],
-        "unlocked": True,
-    },
-    {
-        "name": "study",
-        "displayname": "Study",
-        "description": (
+        rate=10,  # 10 time units
+        consumed=[("Stamina", 0.1)],
+        produced=[("Insights", 0.2)],  # Produces insights over time
+        on_complete_give={},
+        requirements={"Stamina": 1},
+        tags=["mental", "insights", "meditation"],
+        unlocked=True,
+    ),
+    ActivityDef(
+        name="study",
+        displayname="Study",
+        description=(
             "Study your surroundings and acquired knowledge to unlock "
             "new abilities and understanding."
         ),
-        "rate": 4,  # 25 time units
-        "consumed": [("Insights", 0.2), ("Stamina", 0.1)],
-        "produced": [],
-        "on_complete_give": {},
-        "requirements": {"Insights": 5},
-        "tags": ["mental", "research", "study"],
-        "unlocked": True,
-    },
+        rate=4,  # 25 time units
+        consumed=[("Insights", 0.2), ("Stamina", 0.1)],
+        produced=[],
+        on_complete_give={},
+        requirements={"Insights": 5},
+        tags=["mental", "research", "study"],
+        unlocked=True,
+    ),
     # Locked activities (require research/upgrades to unlock)
-    {
-        "name": "mine_ore",
-        "displayname": "Mine Ore",
-        "description": (
+    ActivityDef(
+        name="mine_ore",
+        displayname="Mine Ore",
+        description=(
             "Extract raw ore from the ground. "
             "Ore can be smelted into metal for advanced crafting."
         ),
-        "rate": 6,  # ~16.7 time units
-        "consumed": [("Stamina", 0.8)],
-        "produced": [],
-        "on_complete_give": {"Ore": 2},
-        "requirements": {"Stamina": 4},
-        "tags": ["gathering", "mining", "ore"],
-        "unlocked": False,  # Requires mining_basics research
-    },
-    {
-        "name": "smelt_metal",
-        "displayname": "Smelt Metal",
-        "description": (
+        rate=6,  # ~16.7 time units
+        consumed=[("Stamina", 0.8)],
+        produced=[],
+        on_complete_give={"Ore": 2},
+        requirements={"Stamina": 4},
+        tags=["gathering", "mining", "ore"],
+        unlocked=False,  # Requires mining_basics research
+    ),
+    ActivityDef(
+        name="smelt_metal",
+        displayname="Smelt Metal",
+        description=(
             "Smelt raw ore into usable metal ingots. "
             "Metal is required for advanced tools and equipment."
         ),
-        "rate": 4,  # 25 time units
-        "consumed": [("Stamina", 0.3)],
-        "produced": [],
-        "on_complete_give": {"Ore": -3, "Metal": 1},
-        "requirements": {"Ore": 3},
-        "tags": ["crafting", "smelting", "metal"],
-        "unlocked": False,  # Requires metallurgy research
-    },
-]
+        rate=4,  # 25 time units
+        consumed=[("Stamina", 0.3)],
+        produced=[],
+        on_complete_give={"Ore": -3, "Metal": 1},
+        requirements={"Ore": 3},
+        tags=["crafting", "smelting", "metal"],
+        unlocked=False,  # Requires metallurgy research
+    ),
+)
+
+
+# Lookup indexes, filled by _rebuild_indexes() at import. ACTIVITIES is static
+# after load, so the helpers below are O(1) dict probes instead of scans.
+_ACTIVITIES_BY_NAME: Dict[str, ActivityDef] = {}
+_ACTIVITIES_BY_DISPLAYNAME: Dict[str, ActivityDef] = {}
+_ACTIVITY_POSITIONS: Dict[str, int] = {}  # Definition order, for sorting
+_DEFAULT_UNLOCKED: Tuple[ActivityDef, ...] = ()
 
 
 def get_activity_names() -> List[str]:
     """Return list of all activity display names."""
-    return [a["displayname"] for a in ACTIVITIES]
+    return [a.displayname for a in ACTIVITIES]
 
 
-def get_activity_by_displayname(displayname: str) -> Optional[Dict[str, Any]]:
+def get_activity_by_displayname(displayname: str) -> Optional[ActivityDef]:
     """Get full activity definition by display name."""
-    for activity in ACTIVITIES:
-        if activity["displayname"] == displayname:
-            return activity
-    return None
+    return _ACTIVITIES_BY_DISPLAYNAME.get(displayname)
 
 
-def get_activity_by_name(name: str) -> Optional[Dict[str, Any]]:
+def get_activity_by_name(name: str) -> Optional[ActivityDef]:
     """Get full activity definition by internal name."""
-    for activity in ACTIVITIES:
-        if activity["name"] == name:
-            return activity
-    return None
+    return _ACTIVITIES_BY_NAME.get(name)
 
 
 def get_activity_description(displayname: str) -> str:
     """Get description for an activity by display name."""
-    activity = get_activity_by_displayname(displayname)
+    activity = _ACTIVITIES_BY_DISPLAYNAME.get(displayname)
     if activity:
-        return activity["description"]
+        return activity.description
     return "No description available."
 
 
 def get_activity_requirements(displayname: str) -> Dict[str, int]:
     """Get requirements dict for an activity by display name."""
-    activity = get_activity_by_displayname(displayname)
+    activity = _ACTIVITIES_BY_DISPLAYNAME.get(displayname)
     if activity:
-        return activity.get("requirements", {})
+        return dict(activity.requirements)
     return {}
 
 
-def format_requirements(requirements: Dict[str, int]) -> str:
-    """Format requirements dict as display string."""
-    if not requirements:
-        return "None"
-    return ", ".join(f"{res}: {amt}" for res, amt in requirements.items())
+@lru_cache(maxsize=None)
+def get_activity_detail_text(displayname: str) -> str:
+    """Get details text (description, duration, resource effects) for an activity.
 
+    Cached, since activity definitions never change after import.
+    """
+    activity = _ACTIVITIES_BY_DISPLAYNAME.get(displayname)
+    if not activity:
+        return "No description available."
 
-def format_consumed_produced(activity: Dict[str, Any]) -> str:
-    """Format consumed and produced resources as display string."""
-    parts = []
-    consumed = activity.get("consumed", [])
-    produced = activity.get("produced", [])
-
-    if consumed:
-        consumed_str = ", ".join(f"-{rate} {name}/t" for name, rate in consumed)
-        parts.append(f"Consumes: {consumed_str}")
-
-    if produced:
-        produced_str = ", ".join(f"+{rate} {name}/t" for name, rate in produced)
-        parts.append(f"Produces: {produced_str}")
-
-    on_complete = activity.get("on_complete_give", {})
-    if on_complete:
-        complete_parts = []
-        for res, amt in on_complete.items():
-            if amt > 0:
-                complete_parts.append(f"+{amt} {res}")
-            elif amt < 0:
-                complete_parts.append(f"{amt} {res}")
-        if complete_parts:
-            parts.append(f"On complete: {', '.join(complete_parts)}")
+    rate = activity.rate
+    duration = 100 / rate if rate > 0 else float('inf')
 
-    return "\n".join(parts) if parts else "No resource effects"
+    return (f"{activity.description}\n\n"
+            f"Duration: ~{duration:.1f} time units\n\n"
+            f"{activity.effects_text}")
 
 
 def is_activity_unlocked(name: str, timestate=None) -> bool:
@@ -272,28 +365,84 @@ def is_activity_unlocked(name: str, timestate=None) -> bool:
     activity = get_activity_by_name(name)
     if not activity:
         return False
+    return _is_unlocked(activity, timestate)
 
+
+def _is_unlocked(activity: ActivityDef, timestate=None) -> bool:
+    """is_activity_unlocked for callers that already hold the definition."""
     # Check if unlocked by default
-    if activity.get("unlocked", True):
+    if activity.unlocked:
         return True
 
     # Check if unlocked by upgrade system
     if timestate is not None:
-        # Use time-aware check via timestate
-        return timestate.is_task_unlocked(name)
+        # Time-aware check, with the variable name precomputed
+        return timestate.is_task_unlock_var_set(activity.unlock_var_name)
     else:
         # Fall back to global registry (not time-aware)
         upgrade_registry = get_upgrade_registry()
-        return upgrade_registry.is_task_unlocked(name)
+        return upgrade_registry.is_task_unlocked(activity.name)
+
+
+# Single-entry cache for get_unlocked_activities. Unlocks are recorded by adding
+# variables to a state, which bumps its registry version; the global fallback
+# follows the upgrade registry's version instead.
+_unlocked_cache_key: Optional[Tuple[Any, int]] = None
+_unlocked_cache: Tuple[ActivityDef, ...] = ()
 
 
-def get_unlocked_activities(timestate=None) -> List[Dict[str, Any]]:
+def get_unlocked_activities(timestate=None) -> List[ActivityDef]:
     """Get all activities that are currently unlocked.
 
     Args:
         timestate: Optional TimeState for time-aware unlock checking.
     """
-    return [a for a in ACTIVITIES if is_activity_unlocked(a["name"], timestate)]
+    global _unlocked_cache_key, _unlocked_cache
+    if timestate is not None:
+        key = (timestate, timestate.registry.version)
+    else:
+        upgrade_registry = get_upgrade_registry()
+        key = (upgrade_registry, upgrade_registry.version)
+    if key != _unlocked_cache_key:
+        if timestate is not None:
+            _unlocked_cache = tuple(a for a in ACTIVITIES if _is_unlocked(a, timestate))
+        else:
+            # The registry already tracks upgrade unlocks by name, so only
+            # those need looking up on top of the default-unlocked set
+            extra = [_ACTIVITIES_BY_NAME[name] for name in upgrade_registry.get_unlocked_tasks()
+                     if name in _ACTIVITIES_BY_NAME]
+            extra = [a for a in extra if not a.unlocked]
+            if extra:
+                _unlocked_cache = tuple(sorted(_DEFAULT_UNLOCKED + tuple(extra),
+                                               key=lambda a: _ACTIVITY_POSITIONS[a.name]))
+            else:
+                _unlocked_cache = _DEFAULT_UNLOCKED
+        _unlocked_cache_key = key
+    return list(_unlocked_cache)
+
+
+class _ActivityTask(Task):
+    """Task that applies an activity's on_complete_give resources when finished."""
+
+    def __init__(self, name, rate, displayname=None, consumed=None, produced=None, tags=None,
+                 on_complete_give=None):
+        super().__init__(name, rate, displayname, consumed, produced, tags)
+        # Flattened once here; an immutable tuple is also shared rather than
+        # duplicated when the task is deep-copied along with each TimeState.
+        # Zero amounts would be no-op writes, so they are dropped up front.
+        self.rewards = tuple((var_name, amount) for var_name, amount
+                             in dict(on_complete_give or ()).items() if amount)
+
+    def on_finish_vars(self, timestate):
+        """Apply completion rewards/costs."""
+        if not self.rewards:
+            return
+        t = timestate.time
+        get_variable = timestate.get_variable
+        for var_name, amount in self.rewards:
+            var = get_variable(var_name)
+            if var is not None:
+                var.set(var.get(t) + amount, t)
 
 
 def make_activity_task(displayname: str, t: float, timestate=None):
@@ -307,42 +456,23 @@ def make_activity_task(displayname: str, t: float, timestate=None):
     Returns:
         A Task instance ready to be added to the timeline, or None if not found
     """
-    from timeline import Task
-    from variable import LinearVariable, Variable
-
     activity = get_activity_by_displayname(displayname)
     if not activity:
         return None
 
     # Check if activity is unlocked (time-aware if timestate provided)
-    if not is_activity_unlocked(activity["name"], timestate):
+    if not _is_unlocked(activity, timestate):
         return None
 
-    # Create a custom Task class for this activity
-    on_complete_give = activity.get("on_complete_give", {})
-
-    class _ActivityTask(Task):
-        """Task that applies on_complete_give resources when finished."""
-
-        def on_finish_vars(self, timestate):
-            """Apply completion rewards/costs."""
-            for var_name, amount in on_complete_give.items():
-                var = timestate.get_variable(var_name)
-                if var:
-                    if isinstance(var, LinearVariable):
-                        current = var.get(timestate.time)
-                        var.set(current + amount, timestate.time)
-                    elif isinstance(var, Variable):
-                        var.set(var.get(timestate.time) + amount, timestate.time)
-
     # Create the task instance with tags
     task = _ActivityTask(
-        name=activity["name"],
-        rate=activity["rate"],
-        displayname=activity["displayname"],
-        consumed=activity.get("consumed", []),
-        produced=activity.get("produced", []),
-        tags=activity.get("tags", [])
+        name=activity.name,
+        rate=activity.rate,
+        displayname=activity.displayname,
+        consumed=activity.consumed,
+        produced=activity.produced,
+        tags=activity.tags,
+        on_complete_give=activity.on_complete_give
     )
     task.t = t
     task.is_action = True  # Player-created event
@@ -354,130 +484,194 @@ def make_activity_task(displayname: str, t: float, timestate=None):
 # SCREEN/TAB DEFINITIONS
 # =============================================================================
 
-# Each screen has:
-# - key: Internal identifier
-# - tab_text: Text shown on tab
-# - title: Screen title
-# - description: Description shown on placeholder screens
-
-SCREENS: List[Dict[str, str]] = [
-    {
-        "key": "activities",
-        "tab_text": "Activities",
-        "title": "Activities",
-        "description": "",  # Has custom implementation
-    },
-    {
-        "key": "upgrades",
-        "tab_text": "Upgrades",
-        "title": "Upgrades",
-        "description": (
+@dataclass(frozen=True, slots=True)
+class ScreenDef:
+    """Static definition of a tab in the main content area.
+
+    Attributes:
+        key: Internal identifier
+        tab_text: Text shown on tab
+        title: Screen title
+        description: Description shown on placeholder screens
+    """
+    key: str
+    tab_text: str
+    title: str
+    description: str
+
+    def __post_init__(self):
+        # Short identifiers are compared and used as dict keys by the GUI
+        for name in ("key", "tab_text", "title"):
+            object.__setattr__(self, name, sys.intern(getattr(self, name)))
+
+
+SCREENS: Tuple[ScreenDef, ...] = (
+    ScreenDef(
+        key="activities",
+        tab_text="Activities",
+        title="Activities",
+        description="",  # Has custom implementation
+    ),
+    ScreenDef(
+        key="upgrades",
+        tab_text="Upgrades",
+        title="Upgrades",
+        description=(
             "Upgrade your abilities and tools to become more efficient.\n\n"
             "Upgrades are permanent improvements that persist across runs."
         ),
-    },
-    {
-        "key": "nexus",
-        "tab_text": "Nexus",
-        "title": "Nexus Upgrades",
-        "description": (
+    ),
+    ScreenDef(
+        key="nexus",
+        tab_text="Nexus",
+        title="Nexus Upgrades",
+        description=(
             "Meta-progression upgrades that affect all timelines.\n\n"
             "Nexus upgrades are earned through special achievements and milestones."
         ),
-    },
-    {
-        "key": "research",
-        "tab_text": "Research",
-        "title": "Research",
-        "description": (
+    ),
+    ScreenDef(
+        key="research",
+        tab_text="Research",
+        title="Research",
+        description=(
             "Unlock new technologies and abilities through research.\n\n"
             "Research requires Insights and time to complete."
         ),
-    },
-    {
-        "key": "map",
-        "tab_text": "Map",
-        "title": "World Map",
-        "description": (
+    ),
+    ScreenDef(
+        key="map",
+        tab_text="Map",
+        title="World Map",
+        description=(
             "Explore the world and discover new locations.\n\n"
             "Each location offers unique resources and challenges."
         ),
-    },
-    {
-        "key": "site",
-        "tab_text": "Site",
-        "title": "Site Development",
-        "description": (
+    ),
+    ScreenDef(
+        key="site",
+        tab_text="Site",
+        title="Site Development",
+        description=(
             "Develop your current location with buildings and improvements.\n\n"
             "Buildings provide bonuses and unlock new activities."
         ),
-    },
-    {
-        "key": "events",
-        "tab_text": "Events",
-        "title": "Events Log",
-        "description": (
+    ),
+    ScreenDef(
+        key="events",
+        tab_text="Events",
+        title="Events Log",
+        description=(
             "View the history of events that have occurred on the timeline.\n\n"
             "Events can be reviewed and some can be modified or undone."
         ),
-    },
-    {
-        "key": "achievements",
-        "tab_text": "Achievements",
-        "title": "Achievements",
-        "description": (
+    ),
+    ScreenDef(
+        key="achievements",
+        tab_text="Achievements",
+        title="Achievements",
+        description=(
             "Track your accomplishments and unlock rewards.\n\n"
             "Achievements provide bonuses and unlock new content."
         ),
-    },
-    {
-        "key": "config",
-        "tab_text": "Settings",
-        "title": "Settings",
-        "description": "",  # Has custom implementation
-    },
-]
+    ),
+    ScreenDef(
+        key="config",
+        tab_text="Settings",
+        title="Settings",
+        description="",  # Has custom implementation
+    ),
+)
 
 
-def get_screen_by_key(key: str) -> Dict[str, str]:
-    """Get screen definition by key."""
-    for screen in SCREENS:
-        if screen["key"] == key:
-            return screen
-    return {"key": key, "tab_text": key, "title": key, "description": ""}
+_SCREENS_BY_KEY: Dict[str, ScreenDef] = {}  # Filled by _rebuild_indexes()
+_SCREEN_PLACEHOLDERS: Dict[str, ScreenDef] = {}  # Fallbacks for unknown keys
+
+
+def get_screen_by_key(key: str) -> ScreenDef:
+    """Get screen definition by key.
+
+    Unknown keys get a placeholder definition, created once per key and
+    shared between calls (ScreenDef is frozen, so this is safe).
+    """
+    screen = _SCREENS_BY_KEY.get(key)
+    if screen is not None:
+        return screen
+    screen = _SCREEN_PLACEHOLDERS.get(key)
+    if screen is None:
+        screen = _SCREEN_PLACEHOLDERS[key] = ScreenDef(key=key, tab_text=key, title=key,
+                                                       description="")
+    return screen
+
+
+# =============================================================================
+# LOOKUP INDEXES
+# =============================================================================
+
+def _rebuild_indexes():
+    """Build lookup indexes from ACTIVITIES, SCREENS and ALL_UPGRADES.
+
+    Runs once at the end of module import.
+    """
+    global _DEFAULT_UNLOCKED, _unlocked_cache_key
+    global _research_tree, _research_tree_key
+
+    _ACTIVITIES_BY_NAME.clear()
+    _ACTIVITIES_BY_NAME.update((a.name, a) for a in ACTIVITIES)
+    _ACTIVITIES_BY_DISPLAYNAME.clear()
+    _ACTIVITIES_BY_DISPLAYNAME.update((a.displayname, a) for a in ACTIVITIES)
+    _ACTIVITY_POSITIONS.clear()
+    _ACTIVITY_POSITIONS.update((a.name, i) for i, a in enumerate(ACTIVITIES))
+    _DEFAULT_UNLOCKED = tuple(a for a in ACTIVITIES if a.unlocked)
+    get_activity_detail_text.cache_clear()
+    _unlocked_cache_key = None
+
+    _SCREENS_BY_KEY.clear()
+    _SCREENS_BY_KEY.update((s.key, s) for s in SCREENS)
+    _SCREEN_PLACEHOLDERS.clear()
+
+    _UPGRADES_BY_NAME.clear()
+    _UPGRADES_BY_NAME.update((u.name, u) for u in ALL_UPGRADES)
+    _UPGRADES_BY_TYPE.clear()
+    _UPGRADES_BY_TYPE.update(
+        (t, tuple(u for u in ALL_UPGRADES if u.upgrade_type == t)) for t in UpgradeType
+    )
+    _research_tree = _build_research_tree()
+    _research_tree_key = None
 
 
 # =============================================================================
 # SETTINGS DEFINITIONS
 # =============================================================================
 
-SETTINGS: Dict[str, Any] = {
-    "autosave": {
+# Read-only views, so the shared definitions can't be modified by callers
+SETTINGS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "autosave": MappingProxyType({
         "default": True,
         "label": "Auto-save enabled",
-    },
-    "notifications": {
+    }),
+    "notifications": MappingProxyType({
         "default": True,
         "label": "Show notifications",
-    },
-    "theme": {
+    }),
+    "theme": MappingProxyType({
         "default": "Default",
-        "options": ["Default", "Dark", "Light"],
+        "options": ("Default", "Dark", "Light"),
         "label": "Theme",
-    },
-    "number_format": {
+    }),
+    "number_format": MappingProxyType({
         "default": "Standard",
-        "options": ["Standard", "Scientific", "Engineering"],
+        "options": ("Standard", "Scientific", "Engineering"),
         "label": "Number format",
-    },
-}
+    }),
+})
 
 
 # =============================================================================
 # GAME INFO
 # =============================================================================
 
-GAME_INFO: Dict[str, str] = {
+GAME_INFO: Mapping[str, str] = MappingProxyType({
     "name": "Timescrubber",
     "subtitle": "A Non-Linear Time Idle Game",
     "version": "0.1.0 (Development)",
@@ -485,7 +679,7 @@ GAME_INFO: Dict[str, str] = {
         "A timeline-based idle game where you can manipulate time "
         "and observe how changes cascade through history."
     ),
-}
+})
 
 
 # =============================================================================
@@ -802,8 +996,11 @@ NEXUS_UPGRADES: List[UpgradeDefinition] = [
     ),
 ]
 
-# All upgrades combined
-ALL_UPGRADES: List[UpgradeDefinition] = REGULAR_UPGRADES + RESEARCH_UPGRADES + NEXUS_UPGRADES
+# All upgrades combined; a tuple, since it is shared by the indexes and registry
+ALL_UPGRADES: Tuple[UpgradeDefinition, ...] = (*REGULAR_UPGRADES, *RESEARCH_UPGRADES, *NEXUS_UPGRADES)
+
+_UPGRADES_BY_NAME: Dict[str, UpgradeDefinition] = {}  # Filled by _rebuild_indexes()
+_UPGRADES_BY_TYPE: Dict[UpgradeType, Tuple[UpgradeDefinition, ...]] = {}
 
 
 def register_all_upgrades():
@@ -814,38 +1011,58 @@ def register_all_upgrades():
 
 def get_upgrade_by_name(name: str) -> Optional[UpgradeDefinition]:
     """Get an upgrade definition by name."""
-    for upgrade in ALL_UPGRADES:
-        if upgrade.name == name:
-            return upgrade
-    return None
+    return _UPGRADES_BY_NAME.get(name)
 
 
-def get_upgrades_by_type(upgrade_type: UpgradeType) -> List[UpgradeDefinition]:
+def get_upgrades_by_type(upgrade_type: UpgradeType) -> Tuple[UpgradeDefinition, ...]:
     """Get all upgrades of a specific type."""
-    return [u for u in ALL_UPGRADES if u.upgrade_type == upgrade_type]
+    return _UPGRADES_BY_TYPE.get(upgrade_type, ())
 
 
-def get_research_tree_data() -> List[Dict[str, Any]]:
-    """Get research upgrade data formatted for tree visualization.
+# Research tree nodes, built by _rebuild_indexes(). Only the purchased/visible
+# flags depend on the upgrade registry; they are refreshed when its version moves.
+_research_tree: List[Dict[str, Any]] = []
+_research_tree_key: Optional[Tuple[Any, int]] = None
 
-    Returns:
-        List of dicts with upgrade info and prerequisite connections
-    """
+
+def _build_research_tree() -> List[Dict[str, Any]]:
+    """Build the static part of the research tree nodes."""
     result = []
     for upgrade in RESEARCH_UPGRADES:
-        prereq_names = []
-        for prereq in upgrade.prerequisites:
-            if prereq.prereq_type.value in ("upgrade", "research"):
-                prereq_names.append(prereq.target)
-
         result.append({
             "name": upgrade.name,
             "displayname": upgrade.displayname,
             "description": upgrade.description,
             "position": upgrade.render_position,
-            "prerequisites": prereq_names,
-            "costs": [(c.resource, c.amount) for c in upgrade.costs],
-            "purchased": get_upgrade_registry().is_purchased(upgrade.name),
-            "visible": get_upgrade_registry().is_visible(upgrade.name),
+            "prerequisites": list(upgrade.prereq_upgrade_names),
+            "costs": upgrade.costs_tuple,
+            "purchased": False,
+            "visible": False,
         })
     return result
+
+
+def get_research_tree_data() -> List[Dict[str, Any]]:
+    """Get research upgrade data formatted for tree visualization.
+
+    The returned list is cached and shared between calls; treat it as read-only.
+
+    Returns:
+        List of dicts with upgrade info and prerequisite connections
+    """
+    global _research_tree_key
+    registry = get_upgrade_registry()
+    key = (registry, registry.version)
+    if key != _research_tree_key:
+        is_purchased = registry.is_purchased
+        visible = registry.get_visibility_map()
+        for node in _research_tree:
+            name = node["name"]
+            node["purchased"] = is_purchased(name)
+            node["visible"] = visible.get(name, False)
+        _research_tree_key = key
+    return _research_tree
+
+
+# All definitions are in place; build the lookup indexes
+_rebuild_indexes()
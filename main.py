@@ -1,10 +1,5 @@
-from typing import Dict, List
-import bisect
-from copy import deepcopy
-
 from variable import Variable, LinearVariable
-from timeline import TimeState, Timeline, Event
-from registry import Registry
+from timeline import TimeState
 from gamestate import GameState
 from gamedefs import register_all_upgrades
 from upgrades import get_upgrade_registry
@@ -66,11 +61,10 @@ def main():
 def main_cli():
     """CLI demo mode for testing without GUI."""
     from gamedefs import (
-        get_unlocked_activities, make_activity_task,
+        get_unlocked_activities,
         REGULAR_UPGRADES, RESEARCH_UPGRADES, NEXUS_UPGRADES,
         get_research_tree_data
     )
-    from upgrades import create_purchase_event, UpgradeType
 
     gamestate = create_initial_state()
     gamestate.timeline.recompute(0)
@@ -86,25 +80,21 @@ def main_cli():
     # Show unlocked activities
     print("\n--- Unlocked Activities ---")
     for activity in get_unlocked_activities():
-        tags = activity.get("tags", [])
-        print(f"  {activity['displayname']}: tags={tags}")
+        print(f"  {activity.displayname}: tags={', '.join(sorted(activity.tags))}")
 
     # Show upgrade categories
     print("\n--- Regular Upgrades ---")
     for upgrade in REGULAR_UPGRADES:
-        costs_str = ", ".join(f"{c.amount} {c.resource}" for c in upgrade.costs)
-        print(f"  {upgrade.displayname}: {costs_str}")
+        print(f"  {upgrade.displayname}: {upgrade.costs_display}")
 
     print("\n--- Research Upgrades ---")
     for upgrade in RESEARCH_UPGRADES:
-        costs_str = ", ".join(f"{c.amount} {c.resource}" for c in upgrade.costs)
         pos = upgrade.render_position
-        print(f"  {upgrade.displayname} at ({pos[0]}, {pos[1]}): {costs_str}")
+        print(f"  {upgrade.displayname} at ({pos[0]}, {pos[1]}): {upgrade.costs_display}")
 
     print("\n--- Nexus Upgrades ---")
     for upgrade in NEXUS_UPGRADES:
-        costs_str = ", ".join(f"{c.amount} {c.resource}" for c in upgrade.costs)
-        print(f"  {upgrade.displayname}: {costs_str}")
+        print(f"  {upgrade.displayname}: {upgrade.costs_display}")
 
     # Demonstrate modifier system
     print("\n--- Modifier System Demo ---")
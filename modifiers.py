@@ -8,11 +8,13 @@
 # This allows for interesting upgrade interactions where different sources of
 # bonuses stack multiplicatively while similar bonuses stack additively.
 
-from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass, field
+import math
+import sys
+from typing import Dict, FrozenSet, List, Optional, Tuple, Set
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Modifier:
     """A single modifier that affects a game value.
 
@@ -23,13 +25,20 @@ class Modifier:
         value: The modifier value (e.g., 0.2 for +20%, -0.1 for -10%)
         target_param: The parameter being modified (e.g., "rate", "consumed", "produced")
         target_tags: Tags that must match for this modifier to apply (e.g., ["gathering"])
-                    If empty, applies to all matching parameters
+                    If empty, applies to all matching parameters. Stored as a frozenset
     """
     source: str
     modifier_type: str
     value: float
     target_param: str
-    target_tags: List[str] = field(default_factory=list)
+    target_tags: FrozenSet[str] = frozenset()
+
+    def __post_init__(self):
+        # Interned, so tag matching, grouping by type and indexing by parameter
+        # can compare these by identity
+        self.target_tags = frozenset(sys.intern(tag) for tag in self.target_tags)
+        self.modifier_type = sys.intern(self.modifier_type)
+        self.target_param = sys.intern(self.target_param)
 
     def applies_to(self, param: str, tags: List[str]) -> bool:
         """Check if this modifier applies to a given parameter and tag set.
@@ -50,7 +59,7 @@ class Modifier:
             return True
 
         # Must have at least one matching tag
-        return any(tag in tags for tag in self.target_tags)
+        return not self.target_tags.isdisjoint(tags)
 
 
 class ModifierStack:
@@ -69,18 +78,52 @@ class ModifierStack:
 
     def __init__(self):
         self._modifiers: List[Modifier] = []
+        # The same modifiers grouped by target_param, in insertion order
+        self._by_param: Dict[str, List[Modifier]] = {}
+        # ...and by source, so removing one upgrade's modifiers skips the rest
+        self._by_source: Dict[str, List[Modifier]] = {}
+        # Bumped whenever the stack changes, so callers can cache derived data
+        self.version: int = 0
+        # calculate_multiplier results for the current version, keyed by (param, tags).
+        # Tasks query the same few combinations every time they start or rescale.
+        self._multiplier_cache: Dict[Tuple[str, FrozenSet[str]], float] = {}
+        # Likewise for calculate_additive
+        self._additive_cache: Dict[Tuple[str, FrozenSet[str]], float] = {}
+
+    def _changed(self):
+        """Invalidate cached results after the stack changes."""
+        self.version += 1
+        self._multiplier_cache.clear()
+        self._additive_cache.clear()
 
     def add(self, modifier: Modifier):
         """Add a modifier to the stack."""
         self._modifiers.append(modifier)
+        self._by_param.setdefault(modifier.target_param, []).append(modifier)
+        self._by_source.setdefault(modifier.source, []).append(modifier)
+        self._changed()
 
     def remove_by_source(self, source: str):
         """Remove all modifiers from a specific source."""
-        self._modifiers = [m for m in self._modifiers if m.source != source]
+        removed = self._by_source.pop(source, None)
+        if not removed:
+            return
+        # Modifiers compare by value, so match the removed ones by identity
+        removed_ids = {id(m) for m in removed}
+        self._modifiers[:] = [m for m in self._modifiers if id(m) not in removed_ids]
+        for param in {m.target_param for m in removed}:
+            bucket = self._by_param[param]
+            bucket[:] = [m for m in bucket if id(m) not in removed_ids]
+            if not bucket:
+                del self._by_param[param]
+        self._changed()
 
     def clear(self):
         """Remove all modifiers."""
         self._modifiers = []
+        self._by_param = {}
+        self._by_source = {}
+        self._changed()
 
     def get_modifiers(self) -> List[Modifier]:
         """Get all modifiers in the stack."""
@@ -88,7 +131,9 @@ class ModifierStack:
 
     def get_modifiers_for(self, param: str, tags: List[str]) -> List[Modifier]:
         """Get all modifiers that apply to a given parameter and tags."""
-        return [m for m in self._modifiers if m.applies_to(param, tags)]
+        # Modifier.applies_to, with the parameter check done by the index
+        return [m for m in self._by_param.get(param, ())
+                if not m.target_tags or not m.target_tags.isdisjoint(tags)]
 
     def calculate_multiplier(self, param: str, tags: List[str]) -> float:
         """Calculate the final multiplier for a parameter with given tags.
@@ -103,6 +148,21 @@ class ModifierStack:
         Returns:
             The final multiplier (1.0 = no change, 1.2 = +20%, 0.8 = -20%)
         """
+        # Nothing targets this parameter (always the case on an empty stack),
+        # so skip building the cache key
+        if param not in self._by_param:
+            return 1.0
+        # The frozenset doubles as the cache key and, on a miss, as the tag set
+        # each modifier is tested against with a single C-level isdisjoint
+        tag_set = frozenset(tags)
+        key = (param, tag_set)
+        result = self._multiplier_cache.get(key)
+        if result is None:
+            result = self._multiplier_cache[key] = self._compute_multiplier(param, tag_set)
+        return result
+
+    def _compute_multiplier(self, param: str, tags: List[str]) -> float:
+        """Uncached calculate_multiplier."""
         applicable = self.get_modifiers_for(param, tags)
 
         if not applicable:
@@ -111,16 +171,10 @@ class ModifierStack:
         # Group by modifier type
         by_type: Dict[str, float] = {}
         for mod in applicable:
-            if mod.modifier_type not in by_type:
-                by_type[mod.modifier_type] = 0.0
-            by_type[mod.modifier_type] += mod.value
+            by_type[mod.modifier_type] = by_type.get(mod.modifier_type, 0.0) + mod.value
 
         # Multiply across types (each type contributes (1 + sum_of_values))
-        result = 1.0
-        for type_sum in by_type.values():
-            result *= (1.0 + type_sum)
-
-        return result
+        return math.prod(1.0 + type_sum for type_sum in by_type.values())
 
     def calculate_additive(self, param: str, tags: List[str]) -> float:
         """Calculate a purely additive sum of all matching modifiers.
@@ -135,8 +189,14 @@ class ModifierStack:
         Returns:
             The sum of all modifier values
         """
-        applicable = self.get_modifiers_for(param, tags)
-        return sum(m.value for m in applicable)
+        if param not in self._by_param:
+            return 0.0
+        tag_set = frozenset(tags)
+        key = (param, tag_set)
+        result = self._additive_cache.get(key)
+        if result is None:
+            result = self._additive_cache[key] = sum(m.value for m in self.get_modifiers_for(param, tag_set))
+        return result
 
 
 class ModifierRegistry:
@@ -215,46 +275,63 @@ def reset_modifier_registry():
 
 # Convenience functions for common operations
 
-def apply_rate_modifier(base_rate: float, tags: List[str]) -> float:
+def _scale_rates(rates: List[Tuple[str, float]], multiplier: float) -> List[Tuple[str, float]]:
+    """Scale (resource_name, rate) pairs by multiplier, reusing rates when it is 1.0."""
+    if multiplier == 1.0:
+        return rates
+    return [(name, rate * multiplier) for name, rate in rates]
+
+
+def apply_rate_modifier(base_rate: float, tags: List[str],
+                        registry: Optional[ModifierRegistry] = None) -> float:
     """Apply rate modifiers to a base rate value.
 
     Args:
         base_rate: The base rate before modifiers
         tags: Tags of the target (Task, Process, etc.)
+        registry: Modifier registry to use; defaults to the global one. Callers
+                  applying several modifiers at once can fetch it once and pass it
 
     Returns:
         The modified rate
     """
-    registry = get_modifier_registry()
+    if registry is None:
+        registry = get_modifier_registry()
     multiplier = registry.get_multiplier("rate", tags)
     return base_rate * multiplier
 
 
-def apply_consumed_modifier(base_consumed: List[Tuple[str, float]], tags: List[str]) -> List[Tuple[str, float]]:
+def apply_consumed_modifier(base_consumed: List[Tuple[str, float]], tags: List[str],
+                            registry: Optional[ModifierRegistry] = None) -> List[Tuple[str, float]]:
     """Apply consumption modifiers to resource consumption rates.
 
     Args:
         base_consumed: List of (resource_name, rate) tuples
         tags: Tags of the target
+        registry: Modifier registry to use; defaults to the global one
 
     Returns:
-        Modified list of (resource_name, rate) tuples
+        Modified list of (resource_name, rate) tuples. This is base_consumed
+        itself when no modifiers apply, so it must not be modified
     """
-    registry = get_modifier_registry()
-    multiplier = registry.get_multiplier("consumed", tags)
-    return [(name, rate * multiplier) for name, rate in base_consumed]
+    if registry is None:
+        registry = get_modifier_registry()
+    return _scale_rates(base_consumed, registry.get_multiplier("consumed", tags))
 
 
-def apply_produced_modifier(base_produced: List[Tuple[str, float]], tags: List[str]) -> List[Tuple[str, float]]:
+def apply_produced_modifier(base_produced: List[Tuple[str, float]], tags: List[str],
+                            registry: Optional[ModifierRegistry] = None) -> List[Tuple[str, float]]:
     """Apply production modifiers to resource production rates.
 
     Args:
         base_produced: List of (resource_name, rate) tuples
         tags: Tags of the target
+        registry: Modifier registry to use; defaults to the global one
 
     Returns:
-        Modified list of (resource_name, rate) tuples
+        Modified list of (resource_name, rate) tuples. This is base_produced
+        itself when no modifiers apply, so it must not be modified
     """
-    registry = get_modifier_registry()
-    multiplier = registry.get_multiplier("produced", tags)
-    return [(name, rate * multiplier) for name, rate in base_produced]
+    if registry is None:
+        registry = get_modifier_registry()
+    return _scale_rates(base_produced, registry.get_multiplier("produced", tags))
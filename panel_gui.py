@@ -5,17 +5,41 @@ This module displays resource values and rates (upper part) and
 active tasks/processes (lower part) in a side panel.
 """
 
+import functools
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from variable import Variable, LinearVariable
 from gamestate import GameState
+from timeline import Task, TaskInterrupt, TaskComplete, ProcessEnd
 
 if TYPE_CHECKING:
     from app_gui import TimescrubberApp
 
 
+# Resources that hold steady, and rates (which only change at events), repeat
+# the same values frame after frame, so their display strings are cached.
+# Keyed on the exact value: rounding first could round differently than the
+# format does.
+@functools.lru_cache(maxsize=1024)
+def _format_value(value: float) -> str:
+    """Format a resource value with fewer decimals as it grows."""
+    magnitude = abs(value)
+    decimals = 0 if magnitude >= 1000 else 1 if magnitude >= 100 else 2
+    return f"{value:.{decimals}f}"
+
+
+@functools.lru_cache(maxsize=256)
+def _format_rate(rate: float) -> Tuple[str, Optional[str]]:
+    """Format a resource rate as (text, color); zero rates show nothing."""
+    if rate > 0:
+        return f"+{rate:.2f}/s", "green"
+    elif rate < 0:
+        return f"{rate:.2f}/s", "red"
+    return "", None
+
+
 class ResourcePanel(ttk.Frame):
     """Side panel showing resources and active tasks."""
 
@@ -25,6 +49,18 @@ class ResourcePanel(ttk.Frame):
         self.app = app
         self.resource_labels: Dict[str, Dict[str, ttk.Label]] = {}
         self.task_widgets: Dict[str, Dict] = {}  # Stores task frames and their widgets for reuse
+        self._last_frame_key = None  # (time, timeline version) last drawn
+        self._time_text: Optional[str] = None  # Text last pushed to time_label
+        # Event display names by event name, for the timeline version they came from
+        self._displaynames_version: Optional[int] = None
+        self._displaynames: Dict[str, str] = {}
+        # (task name, progress variable) pairs of the last registry scanned, keyed
+        # by that registry and its version; only LinearVariable progress counts
+        self._progress_vars_key = None
+        self._progress_vars: List[Tuple[str, LinearVariable]] = []
+        # (resource labels, variable) pairs for update_display, keyed the same way
+        self._var_refs_key = None
+        self._var_refs: List[Tuple[Dict, Variable]] = []
 
         # Prevent the frame from shrinking
         self.grid_propagate(False)
@@ -159,14 +195,15 @@ class ResourcePanel(ttk.Frame):
             value_label.grid(row=0, column=1, sticky="e")
 
             # Rate label (for LinearVariables)
+            is_linear = isinstance(var, LinearVariable)
             rate_label = None
-            if isinstance(var, LinearVariable):
+            if is_linear:
                 rate_label = ttk.Label(res_frame, text="", foreground="gray")
                 rate_label.grid(row=1, column=0, columnspan=2, sticky="e")
 
             # Progress bar for bounded resources
             progress = None
-            if isinstance(var, LinearVariable) and var.max < 10000:
+            if is_linear and var.max < 10000:
                 progress = ttk.Progressbar(res_frame, length=200, mode="determinate")
                 progress.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(2, 0))
 
@@ -174,52 +211,79 @@ class ResourcePanel(ttk.Frame):
                 "value": value_label,
                 "rate": rate_label,
                 "progress": progress,
-                "var": var
+                "var": var,
+                # Text last pushed to the value/rate labels, to skip unchanged updates
+                "value_text": None,
+                "rate_text": None,
+                # Whole percent last shown on the progress bar; finer steps aren't visible
+                "bar_percent": None,
+                # Bound once so the per-frame loop skips the attribute lookups
+                "set_value": value_label.configure,
+                "set_rate": rate_label.configure if rate_label is not None else None,
+                "set_progress": progress.configure if progress is not None else None,
             }
 
             row += 1
 
     def update_display(self, current_time: float):
         """Update the display with current values."""
-        # Update time display
-        self.time_label.configure(text=f"{current_time:.2f}")
+        # Everything shown here follows from the time and the timeline, so a
+        # refresh with neither changed (e.g. while paused) has nothing to do
+        frame_key = (current_time, self.gamestate.timeline.version)
+        if frame_key == self._last_frame_key:
+            return
+        self._last_frame_key = frame_key
+
+        # Update time display; small steps can round to the text already shown
+        time_text = f"{current_time:.2f}"
+        if time_text != self._time_text:
+            self.time_label.configure(text=time_text)
+            self._time_text = time_text
 
         # Get current state
         state = self.gamestate.timeline.state_at(current_time)
 
+        # Look up each row's variable only when the state or its variables change
+        registry = state.registry
+        key = (registry, registry.version)
+        if key != self._var_refs_key:
+            self._var_refs = [(labels, registry.get_variable(name))
+                              for name, labels in self.resource_labels.items()]
+            self._var_refs_key = key
+
         # Update resource values
-        for name, labels in self.resource_labels.items():
+        format_value = _format_value
+        format_rate = _format_rate
+        for labels, var in self._var_refs:
             try:
-                var = state.registry.get_variable(name)
                 value = var.get(current_time)
 
-                # Format value display
-                if abs(value) >= 1000:
-                    value_str = f"{value:.0f}"
-                elif abs(value) >= 100:
-                    value_str = f"{value:.1f}"
-                else:
-                    value_str = f"{value:.2f}"
-
-                labels["value"].configure(text=value_str)
+                value_str = format_value(value)
+                if value_str != labels["value_text"]:
+                    labels["set_value"](text=value_str)
+                    labels["value_text"] = value_str
 
                 # Update rate display
-                if labels["rate"] is not None and isinstance(var, LinearVariable):
-                    rate = var.rate
-                    if rate > 0:
-                        rate_str = f"+{rate:.2f}/s"
-                        labels["rate"].configure(text=rate_str, foreground="green")
-                    elif rate < 0:
-                        rate_str = f"{rate:.2f}/s"
-                        labels["rate"].configure(text=rate_str, foreground="red")
-                    else:
-                        labels["rate"].configure(text="")
+                set_rate = labels["set_rate"]
+                if set_rate is not None:
+                    rate_str, color = format_rate(var.rate)
+                    if rate_str != labels["rate_text"]:
+                        if color is not None:
+                            set_rate(text=rate_str, foreground=color)
+                        else:
+                            set_rate(text="")
+                        labels["rate_text"] = rate_str
 
                 # Update progress bar
-                if labels["progress"] is not None and isinstance(var, LinearVariable):
-                    if var.max > var.min:
-                        percent = (value - var.min) / (var.max - var.min) * 100
-                        labels["progress"]["value"] = percent
+                set_progress = labels["set_progress"]
+                if set_progress is not None:
+                    var_min = var.min
+                    var_max = var.max
+                    if var_max > var_min:
+                        percent = int((value - var_min) / (var_max - var_min) * 100)
+                        if percent != labels["bar_percent"]:
+                            set_progress(value=percent)
+                            labels["bar_percent"] = percent
 
             except KeyError:
                 pass  # Variable doesn't exist at this time
@@ -230,38 +294,52 @@ class ResourcePanel(ttk.Frame):
     def _update_tasks(self, state, current_time: float):
         """Update the active tasks display without recreating widgets."""
         # Find current active tasks
-        active_tasks = {}
-        for name in state.registry.keys():
-            if name.endswith("_progress"):
-                var = state.registry.get_variable(name)
-                if isinstance(var, LinearVariable):
-                    task_name = name.replace("_progress", "")
-                    progress = var.get(current_time)
-                    active_tasks[task_name] = progress
-
-        # Remove widgets for tasks that are no longer active (but keep _no_tasks placeholder)
-        tasks_to_remove = [name for name in self.task_widgets if name not in active_tasks and name != "_no_tasks"]
-        for name in tasks_to_remove:
-            widgets = self.task_widgets.pop(name)
-            widgets["frame"].destroy()
+        registry = state.registry
+        key = (registry, registry.version)
+        if key != self._progress_vars_key:
+            self._progress_vars = [(task_name, registry[name])
+                                   for name, task_name in registry.progress_tasks()
+                                   if isinstance(registry[name], LinearVariable)]
+            self._progress_vars_key = key
+        active_tasks = {task_name: var.get(current_time)
+                        for task_name, var in self._progress_vars}
+
+        # Hide rows for tasks that are no longer active. The widgets are kept
+        # so the row can be shown again if the task restarts or the scrubber
+        # moves back, rather than rebuilt.
+        for name, widgets in self.task_widgets.items():
+            if name not in active_tasks and name != "_no_tasks" and widgets["shown"]:
+                widgets["frame"].grid_forget()
+                widgets["shown"] = False
 
         # Update or create widgets for active tasks
+        displaynames = self._get_event_displaynames()
         row = 0
         for task_name, progress in active_tasks.items():
-            # Look up displayname from the timeline events
-            displayname = task_name
-            for event in self.gamestate.timeline.events:
-                if hasattr(event, 'name') and event.name == task_name:
-                    displayname = event.displayname or task_name
-                    break
-
+            displayname = displaynames.get(task_name, task_name)
+
+            progress_text = f"{progress:.1f}%"
+            # Bars are redrawn on every write, so round to the whole percent
+            # the bar can actually show and write only when that changes
+            bar_value = int(min(progress, 100))
+            if task_name not in self.task_widgets:
+                self._recycle_task_row(task_name, active_tasks)
             if task_name in self.task_widgets:
-                # Update existing widgets
+                # Update existing widgets, skipping values Tk already shows
                 widgets = self.task_widgets[task_name]
-                widgets["name_label"].configure(text=displayname)
-                widgets["progress_label"].configure(text=f"{progress:.1f}%")
-                widgets["progress_bar"]["value"] = min(progress, 100)
-                widgets["frame"].grid(row=row, column=0, sticky="ew", pady=2)
+                if displayname != widgets["name_text"]:
+                    widgets["name_label"].configure(text=displayname)
+                    widgets["name_text"] = displayname
+                if progress_text != widgets["progress_text"]:
+                    widgets["progress_label"].configure(text=progress_text)
+                    widgets["progress_text"] = progress_text
+                if bar_value != widgets["bar_value"]:
+                    widgets["progress_bar"]["value"] = bar_value
+                    widgets["bar_value"] = bar_value
+                if not widgets["shown"] or widgets["row"] != row:
+                    widgets["frame"].grid(row=row, column=0, sticky="ew", pady=2)
+                    widgets["shown"] = True
+                    widgets["row"] = row
             else:
                 # Create new widgets
                 task_frame = ttk.Frame(self.tasks_inner)
@@ -273,7 +351,7 @@ class ResourcePanel(ttk.Frame):
                 name_label.grid(row=0, column=0, sticky="w")
 
                 # Progress percentage
-                progress_label = ttk.Label(task_frame, text=f"{progress:.1f}%")
+                progress_label = ttk.Label(task_frame, text=progress_text)
                 progress_label.grid(row=0, column=1, sticky="e")
 
                 # Cancel button
@@ -285,7 +363,7 @@ class ResourcePanel(ttk.Frame):
 
                 # Progress bar
                 prog_bar = ttk.Progressbar(task_frame, length=200, mode="determinate")
-                prog_bar["value"] = min(progress, 100)
+                prog_bar["value"] = bar_value
                 prog_bar.grid(row=1, column=0, columnspan=3, sticky="ew")
 
                 self.task_widgets[task_name] = {
@@ -294,25 +372,63 @@ class ResourcePanel(ttk.Frame):
                     "progress_label": progress_label,
                     "progress_bar": prog_bar,
                     "cancel_btn": cancel_btn,
+                    "shown": True,
+                    "row": row,
+                    # Last values pushed to the widgets
+                    "name_text": displayname,
+                    "progress_text": progress_text,
+                    "bar_value": bar_value,
                 }
 
             row += 1
 
         # Show "No active tasks" message if needed
+        no_tasks = self.task_widgets.get("_no_tasks")
         if row == 0:
-            if "_no_tasks" not in self.task_widgets:
+            if no_tasks is None:
                 no_tasks_label = ttk.Label(self.tasks_inner, text="No active tasks",
                                            foreground="gray")
                 no_tasks_label.grid(row=0, column=0)
-                self.task_widgets["_no_tasks"] = {"frame": no_tasks_label}
-        else:
-            if "_no_tasks" in self.task_widgets:
-                self.task_widgets.pop("_no_tasks")["frame"].destroy()
+                self.task_widgets["_no_tasks"] = {"frame": no_tasks_label, "shown": True}
+            elif not no_tasks["shown"]:
+                no_tasks["frame"].grid(row=0, column=0)
+                no_tasks["shown"] = True
+        elif no_tasks is not None and no_tasks["shown"]:
+            no_tasks["frame"].grid_forget()
+            no_tasks["shown"] = False
+
+    def _get_event_displaynames(self) -> Dict[str, str]:
+        """Map event names to display names, from the first event with each name.
+
+        Rebuilt only when the timeline version changes, instead of scanning the
+        events for every active task on every frame.
+        """
+        timeline = self.gamestate.timeline
+        if timeline.version != self._displaynames_version:
+            displaynames: Dict[str, str] = {}
+            for event in timeline.events:
+                name = getattr(event, "name", None)
+                if name is not None and name not in displaynames:
+                    displaynames[name] = event.displayname or name
+            self._displaynames = displaynames
+            self._displaynames_version = timeline.version
+        return self._displaynames
+
+    def _recycle_task_row(self, task_name: str, active_tasks: Dict[str, float]):
+        """Hand a hidden row of an inactive task over to task_name, if there is one.
+
+        Keeps the number of task rows at the most ever shown at once instead
+        of one per task name seen. The caller's update pass fills in the text.
+        """
+        for name, widgets in self.task_widgets.items():
+            if name != "_no_tasks" and not widgets["shown"] and name not in active_tasks:
+                del self.task_widgets[name]
+                widgets["cancel_btn"].configure(command=lambda tn=task_name: self._cancel_task(tn))
+                self.task_widgets[task_name] = widgets
+                return
 
     def _cancel_task(self, task_name: str):
         """Cancel a running task."""
-        from timeline import Task, TaskInterrupt, TaskComplete, ProcessEnd
-
         current_time = self.app.current_time
 
         # Find the task instance that is currently running at current_time
@@ -341,4 +457,5 @@ class ResourcePanel(ttk.Frame):
                         interrupt.is_action = True  # Player action, should not be auto-removed
                         event.end_event = interrupt
                         self.gamestate.timeline.add_event(interrupt)
+                        self.app.mark_dirty()
                         break
@@ -1,26 +1,87 @@
-class Registry():
-    vars: dict = None
-    time: float = 0.0
+class Registry(dict):
+    """Variables of one TimeState, by name.
+
+    A dict subclass, so lookups, membership tests and keys() run as plain dict
+    operations. Every mutator is overridden to bump version and keep the
+    progress index current.
+    """
+    __slots__ = ("time", "version", "_progress_names")
+
+    PROGRESS_SUFFIX = "_progress"
+    _MISSING = object()  # Default for pop, so None can be passed explicitly
 
     def __init__(self, t):
+        super().__init__()
         self.time = t
-        self.vars = {}
-    
+        self.version = 0 # Bumped when variables are added or removed, so callers can cache derived data
+        # Task progress variable names mapped to their task names, in insertion order
+        self._progress_names = {}
+
+    # Registries stand for distinct states even when their contents match, so
+    # compare and hash by identity like the other timeline objects
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
+
     def add_variable(self, var):
-        self.vars[var.name] = var
+        self[var.name] = var
 
-    def get_variable(self, name):
-        return self.vars.get(name, None)
+    def __setitem__(self, name, var):
+        super().__setitem__(name, var)
+        if name.endswith(self.PROGRESS_SUFFIX):
+            self._progress_names[name] = name[:-len(self.PROGRESS_SUFFIX)]
+        self.version += 1
 
-    def keys(self):
-        return self.vars.keys()
+    def copy_at(self, t):
+        """Return a registry at time t holding clones of this registry's variables, rehomed to t."""
+        new = Registry(t)
+        # Filled through dict.update, and the index copied whole, rather than
+        # doing the per-variable bookkeeping in __setitem__
+        dict.update(new, {name: var.clone_at(t) for name, var in self.items()})
+        new._progress_names = self._progress_names.copy()
+        return new
 
-    def __getitem__(self, name):
-        return self.vars[name]
+    def progress_tasks(self):
+        """(progress variable name, task name) pairs, without scanning every variable."""
+        return self._progress_names.items()
 
-    def __contains__(self, name):
-        return name in self.vars
+    get_variable = dict.get
 
     def __delitem__(self, name):
-        if name in self.vars:
-            del self.vars[name]
\ No newline at end of file
+        if name in self:
+            super().__delitem__(name)
+            self._progress_names.pop(name, None)
+            self.version += 1
+
+    def update(self, *args, **kwargs):
+        for name, var in dict(*args, **kwargs).items():
+            self[name] = var
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def pop(self, name, default=_MISSING):
+        if name in self:
+            var = self[name]
+            del self[name]
+            return var
+        if default is self._MISSING:
+            raise KeyError(name)
+        return default
+
+    def popitem(self):
+        name, var = super().popitem()
+        self._progress_names.pop(name, None)
+        self.version += 1
+        return name, var
+
+    def clear(self):
+        super().clear()
+        self._progress_names.clear()
+        self.version += 1
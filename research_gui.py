@@ -147,6 +147,8 @@ class ResearchScreen(ttk.Frame):
         registry = get_upgrade_registry()
         current_time = self.app.current_time
         ts = self.gamestate.timeline.state_at(current_time)
+        # Visible here includes purchased at ts
+        visible = registry.get_visibility_map(ts)
 
         # First pass: calculate positions and draw connections
         for upgrade in RESEARCH_UPGRADES:
@@ -155,18 +157,18 @@ class ResearchScreen(ttk.Frame):
 
         # Draw prerequisite lines first (so they're behind nodes)
         for upgrade in RESEARCH_UPGRADES:
-            if not registry.is_visible(upgrade.name, ts) and not ts.is_upgrade_purchased(upgrade.name):
+            if not visible.get(upgrade.name, False):
                 continue
 
             x, y = self._get_node_screen_position(upgrade.render_position)
             node_center = (x + NODE_WIDTH // 2, y + NODE_HEIGHT // 2)
 
-            for prereq in upgrade.prerequisites:
-                if prereq.target in self.node_positions:
-                    prereq_center = self.node_positions[prereq.target]
+            for prereq_name in upgrade.prereq_upgrade_names:
+                if prereq_name in self.node_positions:
+                    prereq_center = self.node_positions[prereq_name]
                     # Draw line from prerequisite to this node
                     line_color = "#4a4a4a"
-                    if ts.is_upgrade_purchased(prereq.target):
+                    if ts.is_upgrade_purchased(prereq_name):
                         line_color = "#4CAF50"  # Green if prereq is purchased
 
                     self.canvas.create_line(
@@ -178,17 +180,12 @@ class ResearchScreen(ttk.Frame):
         # Second pass: draw nodes
         for upgrade in RESEARCH_UPGRADES:
             # Determine visibility (time-aware)
-            is_visible = registry.is_visible(upgrade.name, ts)
+            is_visible = visible.get(upgrade.name, False)
             is_purchased = ts.is_upgrade_purchased(upgrade.name)
 
             if not is_visible and not is_purchased:
                 # Show as locked placeholder if any prerequisite is visible/purchased
-                any_prereq_visible = False
-                for prereq in upgrade.prerequisites:
-                    if registry.is_visible(prereq.target, ts) or ts.is_upgrade_purchased(prereq.target):
-                        any_prereq_visible = True
-                        break
-                if not any_prereq_visible:
+                if not any(visible.get(prereq.target, False) for prereq in upgrade.prerequisites):
                     continue  # Don't show at all
 
             x, y = self._get_node_screen_position(upgrade.render_position)
@@ -378,6 +375,7 @@ class ResearchScreen(ttk.Frame):
                 print(f"Researched: {self.selected_research.displayname}")
                 self._draw_tree()
                 self._update_details()
+                self.app.mark_dirty()
             else:
                 print(f"Failed to create research event: {self.selected_research.displayname}")
         else:
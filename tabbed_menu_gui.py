@@ -19,11 +19,28 @@ from typing import Dict, TYPE_CHECKING
 
 from gamestate import GameState
 from gamedefs import SCREENS, SETTINGS, GAME_INFO, get_screen_by_key
+from activities_gui import ActivitiesScreen
+from upgrades_gui import UpgradesScreen, NexusScreen
+from research_gui import ResearchScreen
 
 if TYPE_CHECKING:
     from app_gui import TimescrubberApp
 
 
+# Notebook index of each screen key, for select_tab
+_TAB_INDEX: Dict[str, int] = {
+    "activities": 0,
+    "upgrades": 1,
+    "nexus": 2,
+    "research": 3,
+    "map": 4,
+    "site": 5,
+    "events": 6,
+    "achievements": 7,
+    "config": 8,
+}
+
+
 class TabbedMenu(ttk.Frame):
     """Main content area with tabbed navigation."""
 
@@ -44,17 +61,12 @@ class TabbedMenu(ttk.Frame):
         self.notebook = ttk.Notebook(self)
         self.notebook.grid(row=0, column=0, sticky="nsew")
 
-        # Import screens with custom implementations
-        from activities_gui import ActivitiesScreen
-        from upgrades_gui import UpgradesScreen, NexusScreen
-        from research_gui import ResearchScreen
-
         # Create tabs from SCREENS definitions
         for screen_def in SCREENS:
-            key = screen_def["key"]
-            tab_text = screen_def["tab_text"]
-            title = screen_def["title"]
-            description = screen_def["description"]
+            key = screen_def.key
+            tab_text = screen_def.tab_text
+            title = screen_def.title
+            description = screen_def.description
 
             if key == "activities":
                 # Activities has custom implementation
@@ -84,6 +96,9 @@ class TabbedMenu(ttk.Frame):
             self.notebook.add(frame, text=tab_text)
             self.screens[key] = frame
 
+        # Newly shown screen needs a refresh even while paused
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.app.mark_dirty())
+
     def _create_placeholder(self, title: str, description: str) -> ttk.Frame:
         """Create a placeholder screen with a title and description."""
         frame = ttk.Frame(self.notebook, padding=20)
@@ -198,16 +213,6 @@ class TabbedMenu(ttk.Frame):
 
     def select_tab(self, tab_name: str):
         """Programmatically select a tab by name."""
-        tab_names = {
-            "activities": 0,
-            "upgrades": 1,
-            "nexus": 2,
-            "research": 3,
-            "map": 4,
-            "site": 5,
-            "events": 6,
-            "achievements": 7,
-            "config": 8,
-        }
-        if tab_name.lower() in tab_names:
-            self.notebook.select(tab_names[tab_name.lower()])
+        index = _TAB_INDEX.get(tab_name.lower())
+        if index is not None:
+            self.notebook.select(index)
@@ -0,0 +1,232 @@
+"""
+Tests for the game content lookup helpers in gamedefs.
+
+These tests verify:
+1. Activity lookups by name and display name
+2. Screen lookups, including the fallback for unknown keys
+3. Upgrade lookups and the research tree data
+"""
+
+import unittest
+
+from gamedefs import (
+    ACTIVITIES, SCREENS, ActivityDef,
+    get_activity_by_name, get_activity_by_displayname, get_activity_names,
+    get_screen_by_key, get_unlocked_activities,
+    ALL_UPGRADES, RESEARCH_UPGRADES, get_upgrade_by_name, get_upgrades_by_type,
+    get_research_tree_data, register_all_upgrades
+)
+from upgrades import UpgradeType, UpgradeRegistry, get_upgrade_registry, reset_upgrade_registry
+from timeline import TimeState
+from variable import Variable
+
+
+class TestActivityLookups(unittest.TestCase):
+    """Test activity lookups against the definitions list."""
+
+    def test_lookup_by_name_and_displayname(self):
+        """Every activity should be found by both of its names."""
+        for activity in ACTIVITIES:
+            self.assertIs(get_activity_by_name(activity.name), activity)
+            self.assertIs(get_activity_by_displayname(activity.displayname), activity)
+
+    def test_unknown_activity(self):
+        """Unknown names should return None."""
+        self.assertIsNone(get_activity_by_name("no_such_activity"))
+        self.assertIsNone(get_activity_by_displayname("No Such Activity"))
+
+    def test_activity_names_in_order(self):
+        """Activity names should follow definition order."""
+        self.assertEqual(list(get_activity_names()), [a.displayname for a in ACTIVITIES])
+
+    def test_unlocked_activities_follow_state_unlocks(self):
+        """Cached unlocked activities should pick up unlocks added to the same state."""
+        ts = TimeState(0)
+        locked = [a.name for a in ACTIVITIES if not a.unlocked]
+        self.assertTrue(locked)
+        names = [a.name for a in get_unlocked_activities(ts)]
+        self.assertNotIn(locked[0], names)
+
+        ts.add_unlocked_task(locked[0])
+        names = [a.name for a in get_unlocked_activities(ts)]
+        self.assertIn(locked[0], names)
+
+
+class TestActivityDef(unittest.TestCase):
+    """Test values derived when an ActivityDef is built."""
+
+    def test_repeated_resources_are_summed(self):
+        """Rates naming the same resource should merge into one entry."""
+        activity = ActivityDef(
+            name="double_burn",
+            displayname="Double Burn",
+            description="",
+            rate=10,
+            consumed=[("Wood", 1), ("Stone", 0.5), ("Wood", 2)],
+            produced=[],
+            on_complete_give={},
+            requirements={},
+            tags=[],
+        )
+        self.assertEqual(activity.consumed, (("Wood", 3), ("Stone", 0.5)))
+        self.assertEqual(activity.produced, ())
+
+    def test_effect_text_parts(self):
+        """Effect text should be joined from the precomputed parts."""
+        activity = ActivityDef(
+            name="trade",
+            displayname="Trade",
+            description="",
+            rate=10,
+            consumed=[("Wood", 1)],
+            produced=[("Gold", 0.5)],
+            on_complete_give={"Gold": 5, "Wood": -2, "Stone": 0},
+            requirements={"Wood": 10},
+            tags=[],
+        )
+        self.assertEqual(activity.consumed_text, "-1 Wood/t")
+        self.assertEqual(activity.produced_text, "+0.5 Gold/t")
+        self.assertEqual(activity.on_complete_text, "+5 Gold, -2 Wood")
+        self.assertEqual(activity.effects_text,
+                         "Consumes: -1 Wood/t\nProduces: +0.5 Gold/t\nOn complete: +5 Gold, -2 Wood")
+
+    def test_text_without_effects(self):
+        """An activity with no rates or rewards should get the placeholder effects text."""
+        activity = ActivityDef(
+            name="test_activity",
+            displayname="Test Activity",
+            description="",
+            rate=10,
+            consumed=[],
+            produced=[],
+            on_complete_give={},
+            requirements={"Wood": 1},
+            tags=[],
+        )
+        self.assertEqual(activity.requirements_text, "Wood: 1")
+        self.assertEqual(activity.effects_text, "No resource effects")
+
+    def test_definitions_are_hashable(self):
+        """Definitions should be hashable, with dict and list fields stored in hashable forms."""
+        for activity in ACTIVITIES:
+            self.assertIsInstance(activity.requirements, tuple)
+            self.assertIsInstance(activity.on_complete_give, tuple)
+            self.assertIsInstance(activity.tags, frozenset)
+            hash(activity)
+        wood = get_activity_by_name("gather_wood")
+        self.assertEqual(wood.requirements, (("Stamina", 2),))
+        self.assertIn("gathering", wood.tags)
+
+
+class TestScreenLookups(unittest.TestCase):
+    """Test screen lookups and fallback."""
+
+    def test_lookup_by_key(self):
+        """Every screen should be found by its key."""
+        for screen in SCREENS:
+            self.assertIs(get_screen_by_key(screen.key), screen)
+
+    def test_unknown_key_fallback(self):
+        """Unknown keys should get a placeholder definition."""
+        screen = get_screen_by_key("missing")
+        self.assertEqual(screen.key, "missing")
+        self.assertEqual(screen.tab_text, "missing")
+        self.assertEqual(screen.description, "")
+
+    def test_unknown_key_placeholder_reused(self):
+        """Repeated misses for the same key should share one placeholder."""
+        self.assertIs(get_screen_by_key("missing"), get_screen_by_key("missing"))
+        self.assertIsNot(get_screen_by_key("missing"), get_screen_by_key("other"))
+
+
+class TestUpgradeLookups(unittest.TestCase):
+    """Test upgrade lookups against the definitions list."""
+
+    def test_lookup_by_name(self):
+        """Every upgrade should be found by its name."""
+        for upgrade in ALL_UPGRADES:
+            self.assertIs(get_upgrade_by_name(upgrade.name), upgrade)
+        self.assertIsNone(get_upgrade_by_name("no_such_upgrade"))
+
+    def test_upgrades_by_type(self):
+        """Type buckets should match the per-type definition lists."""
+        self.assertEqual(list(get_upgrades_by_type(UpgradeType.RESEARCH)), RESEARCH_UPGRADES)
+
+    def test_definitions_are_frozen(self):
+        """Shared upgrade definitions should reject attribute changes."""
+        upgrade = ALL_UPGRADES[0]
+        with self.assertRaises(AttributeError):
+            upgrade.name = "renamed"
+        self.assertFalse(hasattr(upgrade, "__dict__"))
+
+    def test_registry_buckets_follow_registration(self):
+        """Re-registering an upgrade should replace it in its type bucket."""
+        registry = UpgradeRegistry()
+        registry.register_all(ALL_UPGRADES)
+        registry.register_all(ALL_UPGRADES)
+        self.assertEqual(registry.get_by_type(UpgradeType.RESEARCH), RESEARCH_UPGRADES)
+
+
+class TestResearchTreeData(unittest.TestCase):
+    """Test the cached research tree data."""
+
+    def setUp(self):
+        reset_upgrade_registry()
+        register_all_upgrades()
+
+    def tearDown(self):
+        get_upgrade_registry().reset()
+        reset_upgrade_registry()
+
+    def test_flags_follow_purchases(self):
+        """Purchased/visible flags should update after a purchase."""
+        root = RESEARCH_UPGRADES[0].name
+        node = next(n for n in get_research_tree_data() if n["name"] == root)
+        self.assertFalse(node["purchased"])
+
+        ts = TimeState(0)
+        ts.add_variable(Variable("Insights", value=1000))
+        self.assertTrue(get_upgrade_registry().purchase(root, ts, 0))
+        node = next(n for n in get_research_tree_data() if n["name"] == root)
+        self.assertTrue(node["purchased"])
+
+    def test_global_unlocked_activities_follow_purchases(self):
+        """Without a state, unlocked activities should follow registry unlocks in order."""
+        names = [a.name for a in get_unlocked_activities()]
+        self.assertEqual(names, [a.name for a in ACTIVITIES if a.unlocked])
+        self.assertNotIn("mine_ore", names)
+
+        ts = TimeState(0)
+        ts.add_variable(Variable("Insights", value=1000))
+        registry = get_upgrade_registry()
+        self.assertTrue(registry.purchase("basic_knowledge", ts, 0))
+        self.assertTrue(registry.purchase("mining_basics", ts, 0))
+        names = [a.name for a in get_unlocked_activities()]
+        self.assertEqual(names, [a.name for a in ACTIVITIES
+                                 if a.unlocked or a.name == "mine_ore"])
+
+    def test_visibility_map_matches_is_visible(self):
+        """The bulk visibility map should agree with per-upgrade checks."""
+        registry = get_upgrade_registry()
+        ts = TimeState(0)
+        visible = registry.get_visibility_map(ts)
+        self.assertEqual(set(visible), {u.name for u in ALL_UPGRADES})
+        for name, is_visible in visible.items():
+            self.assertEqual(is_visible, registry.is_visible(name, ts))
+
+    def test_global_visibility_follows_purchases(self):
+        """Incremental visibility updates should match recomputing from purchases and prerequisites."""
+        registry = get_upgrade_registry()
+        ts = TimeState(0)
+        ts.add_variable(Variable("Insights", value=1000))
+        registry.get_visibility_map()
+        for upgrade in RESEARCH_UPGRADES[:3]:
+            registry.purchase(upgrade.name, ts, 0)
+            expected = {name: registry.is_purchased(name) or registry.check_prerequisites(name)
+                        for name in registry.get_visibility_map()}
+            self.assertEqual(registry.get_visibility_map(), expected)
+        self.assertTrue(registry.is_visible("mining_basics"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the modifier stacking rules.
+
+These tests verify:
+1. Same-type modifiers add, different types multiply
+2. Tag filtering and per-parameter lookups
+3. Cached results follow changes to the stack
+"""
+
+import unittest
+
+from modifiers import (
+    Modifier, ModifierStack, get_modifier_registry, reset_modifier_registry,
+    apply_consumed_modifier, apply_produced_modifier
+)
+
+
+class TestModifierStack(unittest.TestCase):
+    """Test multiplier calculation on a ModifierStack."""
+
+    def setUp(self):
+        self.stack = ModifierStack()
+
+    def test_empty_stack(self):
+        """No modifiers means no change."""
+        self.assertEqual(self.stack.calculate_multiplier("rate", ["gathering"]), 1.0)
+
+    def test_stacking(self):
+        """Same types should add, different types should multiply."""
+        self.stack.add(Modifier("a", "tools", 0.2, "rate", ["gathering"]))
+        self.stack.add(Modifier("b", "tools", 0.15, "rate", ["gathering"]))
+        self.stack.add(Modifier("c", "research", 0.1, "rate"))
+        self.assertAlmostEqual(self.stack.calculate_multiplier("rate", ["gathering"]), 1.35 * 1.1)
+        self.assertAlmostEqual(self.stack.calculate_multiplier("rate", ["crafting"]), 1.1)
+        self.assertEqual(self.stack.calculate_multiplier("consumed", ["gathering"]), 1.0)
+
+    def test_modifiers_for_param(self):
+        """Lookups should return only matching modifiers, in insertion order."""
+        a = Modifier("a", "tools", 0.2, "rate", ["gathering"])
+        b = Modifier("b", "tools", 0.1, "produced")
+        c = Modifier("c", "research", 0.1, "rate")
+        for modifier in (a, b, c):
+            self.stack.add(modifier)
+        self.assertEqual(self.stack.get_modifiers_for("rate", ["gathering"]), [a, c])
+        self.assertEqual(self.stack.get_modifiers_for("rate", ["crafting"]), [c])
+
+        self.stack.remove_by_source("c")
+        self.assertEqual(self.stack.get_modifiers_for("rate", ["gathering"]), [a])
+        self.assertEqual(self.stack.get_modifiers_for("produced", []), [b])
+
+    def test_remove_by_source(self):
+        """Removing a source should leave other sources' modifiers in place."""
+        self.stack.add(Modifier("a", "tools", 0.2, "rate"))
+        self.stack.add(Modifier("b", "tools", 0.2, "rate"))
+        self.stack.add(Modifier("a", "tools", 0.1, "produced"))
+
+        self.stack.remove_by_source("a")
+        self.assertEqual([m.source for m in self.stack.get_modifiers()], ["b"])
+        self.assertEqual([m.source for m in self.stack.get_modifiers_for("rate", [])], ["b"])
+        self.assertEqual(self.stack.get_modifiers_for("produced", []), [])
+
+        version = self.stack.version
+        self.stack.remove_by_source("a")
+        self.assertEqual(self.stack.version, version)
+
+    def test_cache_follows_changes(self):
+        """Adding or removing modifiers should be reflected in later queries."""
+        self.assertEqual(self.stack.calculate_multiplier("rate", ["gathering"]), 1.0)
+
+        self.assertEqual(self.stack.calculate_additive("rate", ["gathering"]), 0)
+        self.stack.add(Modifier("a", "tools", 0.5, "rate", ["gathering"]))
+        self.assertEqual(self.stack.calculate_multiplier("rate", ["gathering"]), 1.5)
+        self.assertEqual(self.stack.calculate_additive("rate", ["gathering"]), 0.5)
+
+        self.stack.remove_by_source("a")
+        self.assertEqual(self.stack.calculate_multiplier("rate", ["gathering"]), 1.0)
+        self.assertEqual(self.stack.calculate_additive("rate", ["gathering"]), 0)
+
+        self.stack.add(Modifier("a", "tools", 0.5, "rate"))
+        self.stack.clear()
+        self.assertEqual(self.stack.calculate_multiplier("rate", ["gathering"]), 1.0)
+
+
+class TestApplyModifiers(unittest.TestCase):
+    """Test the rate-list helpers on the global registry."""
+
+    def setUp(self):
+        reset_modifier_registry()
+
+    def tearDown(self):
+        reset_modifier_registry()
+
+    def test_unmodified_rates_reused(self):
+        """Without applicable modifiers the base list should be returned as is."""
+        base = [("Wood", 2.0), ("Stone", 1.0)]
+        self.assertIs(apply_consumed_modifier(base, ["gathering"]), base)
+        self.assertIs(apply_produced_modifier(base, ["gathering"]), base)
+
+    def test_modified_rates_scaled(self):
+        """Applicable modifiers should scale every rate."""
+        get_modifier_registry().add_modifier(Modifier("a", "tools", 0.5, "produced", ["gathering"]))
+        base = [("Wood", 2.0), ("Stone", 1.0)]
+        self.assertEqual(apply_produced_modifier(base, ["gathering"]), [("Wood", 3.0), ("Stone", 1.5)])
+        self.assertEqual(base, [("Wood", 2.0), ("Stone", 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -463,6 +463,106 @@ class TestTaskCancellation(unittest.TestCase):
         self.assertEqual(stamina_at_10, stamina_at_15)
 
 
+class TestTimelineVersion(unittest.TestCase):
+    """Test that Timeline.version tracks changes for cache invalidation."""
+
+    def setUp(self):
+        self.initial = TimeState(0)
+        self.initial.add_variable(LinearVariable('Stamina', value=100, min=0, max=100, rate=0))
+        self.timeline = Timeline(self.initial)
+        self.timeline.max_time = 100
+
+    def test_version_bumps_on_add_and_remove(self):
+        """Adding or removing an event should change the version."""
+        task = Task(name="task", rate=5, consumed=[("Stamina", 0.5)], produced=[])
+        task.t = 0
+        task.is_action = True
+
+        v0 = self.timeline.version
+        self.timeline.add_event(task)
+        v1 = self.timeline.version
+        self.assertGreater(v1, v0)
+
+        self.timeline.remove_event(task)
+        self.assertGreater(self.timeline.version, v1)
+
+    def test_version_stable_on_reads(self):
+        """Querying states should not change the version."""
+        v0 = self.timeline.version
+        self.timeline.state_at(50)
+        self.timeline.next_event(0)
+        self.assertEqual(self.timeline.version, v0)
+
+
+class TestTimeStateCopy(unittest.TestCase):
+    """Test that copied TimeStates are independent of the original."""
+
+    def test_copy_is_independent(self):
+        """Changing a copy should not affect the original state."""
+        ts = TimeState(0)
+        ts.add_variable(Variable('Wood', value=5, tags=["resource"]))
+        ts.add_variable(LinearVariable('Stamina', value=50, min=0, max=100, rate=1))
+
+        new_ts = ts.copy(10)
+        self.assertEqual(new_ts.time, 10)
+        self.assertEqual(new_ts.get_variable('Stamina').get(10), 60)
+        self.assertEqual(new_ts.get_variable('Stamina').t0, 10)
+
+        new_ts.get_variable('Wood').set(1, 10)
+        new_ts.get_variable('Wood').add_tag("spent")
+        new_ts.get_variable('Stamina').rate = -1
+        new_ts.add_variable(Variable('Stone', value=1))
+
+        self.assertEqual(ts.get_variable('Wood').get(0), 5)
+        self.assertEqual(ts.get_variable('Wood').tags, ["resource"])
+        self.assertEqual(ts.get_variable('Stamina').rate, 1)
+        self.assertEqual(ts.get_variable('Stamina').t0, 0)
+        self.assertNotIn('Stone', ts.registry)
+
+    def test_registries_do_not_share_storage(self):
+        """Separately created registries should start empty and stay separate."""
+        first = Registry(0)
+        second = Registry(1)
+        first.add_variable(Variable('Wood', value=5))
+        self.assertNotIn('Wood', second)
+        self.assertEqual(len(Registry(2)), 0)
+        self.assertEqual((first.version, second.version), (1, 0))
+
+    def test_progress_tasks_follow_changes(self):
+        """The progress index should follow adds, deletes and copies."""
+        registry = Registry(0)
+        registry.add_variable(Variable('Wood', value=5))
+        registry.add_variable(LinearVariable('chop_progress', value=0, rate=1))
+        self.assertEqual(list(registry.progress_tasks()), [('chop_progress', 'chop')])
+
+        copied = registry.copy_at(1)
+        self.assertEqual(registry.copy().keys(), registry.keys())  # Plain dict copy still works
+        del registry['chop_progress']
+        self.assertEqual(list(registry.progress_tasks()), [])
+        self.assertEqual(list(copied.progress_tasks()), [('chop_progress', 'chop')])
+
+    def test_dict_mutators_keep_index_and_version(self):
+        """Mutating through the dict API should bump version and keep the index."""
+        registry = Registry(0)
+        steps = [
+            lambda: registry.__setitem__('chop_progress', LinearVariable('chop_progress', value=0, rate=1)),
+            lambda: registry.update(dig_progress=LinearVariable('dig_progress', value=0, rate=1)),
+            lambda: registry.setdefault('Wood', Variable('Wood', value=1)),
+            lambda: registry.pop('chop_progress'),
+        ]
+        for step in steps:
+            version = registry.version
+            step()
+            self.assertGreater(registry.version, version)
+        self.assertEqual(list(registry.progress_tasks()), [('dig_progress', 'dig')])
+        self.assertIsNone(registry.pop('missing', None))
+        with self.assertRaises(KeyError):
+            registry.pop('missing')
+
+        registry.clear()
+        self.assertEqual(list(registry.progress_tasks()), [])
+
+
 class TestTaskChaining(unittest.TestCase):
     """Test Task chaining where one task queues another on completion."""
 
@@ -700,6 +800,12 @@ class TestEventOrdering(unittest.TestCase):
         times = [s.time for s in self.timeline.state_cache]
         self.assertEqual(times, sorted(times))
 
+        # So should the events list, and removal should take out only that event
+        names = [e.name for e in self.timeline.events]
+        self.assertEqual(names, ["set_at_2", "set_at_5", "set_at_10", "set_at_15"])
+        self.timeline.remove_event(self.timeline.events[1])
+        self.assertEqual([e.name for e in self.timeline.events], ["set_at_2", "set_at_10", "set_at_15"])
+
 
 class TestTaskInvalidation(unittest.TestCase):
     """Test Task invalidation when earlier events change."""
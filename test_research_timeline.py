@@ -57,10 +57,10 @@ def test_research_prerequisites():
     print(f"is_activity_unlocked('mine_ore', ts_t0): {is_activity_unlocked('mine_ore', ts_t0)}")
     print(f"Unlocked activities at t=0:")
     for a in get_unlocked_activities(ts_t0):
-        print(f"  - {a['displayname']}")
+        print(f"  - {a.displayname}")
 
     # Verify mine_ore is NOT in the list
-    unlocked_names = [a['name'] for a in get_unlocked_activities(ts_t0)]
+    unlocked_names = [a.name for a in get_unlocked_activities(ts_t0)]
     assert 'mine_ore' not in unlocked_names, "ERROR: mine_ore should NOT be unlocked at t=0"
     print("PASS: mine_ore is correctly NOT available at t=0")
 
@@ -86,7 +86,7 @@ def test_research_prerequisites():
     print(f"basic_knowledge purchased at t=50: {ts_t50.is_upgrade_purchased('basic_knowledge')}")
     print(f"mining_basics purchased at t=50: {ts_t50.is_upgrade_purchased('mining_basics')}")
 
-    unlocked_at_50 = [a['name'] for a in get_unlocked_activities(ts_t50)]
+    unlocked_at_50 = [a.name for a in get_unlocked_activities(ts_t50)]
     assert 'mine_ore' not in unlocked_at_50, "ERROR: mine_ore should NOT be unlocked at t=50"
     print("PASS: mine_ore is correctly NOT available at t=50")
 
@@ -97,7 +97,7 @@ def test_research_prerequisites():
     print(f"basic_knowledge purchased at t=70: {ts_t70.is_upgrade_purchased('basic_knowledge')}")
     print(f"mining_basics purchased at t=70: {ts_t70.is_upgrade_purchased('mining_basics')}")
 
-    unlocked_at_70 = [a['name'] for a in get_unlocked_activities(ts_t70)]
+    unlocked_at_70 = [a.name for a in get_unlocked_activities(ts_t70)]
     assert 'mine_ore' in unlocked_at_70, "ERROR: mine_ore SHOULD be unlocked at t=70"
     print("PASS: mine_ore is correctly available at t=70")
 
@@ -1,13 +1,20 @@
+from array import array
 from copy import deepcopy
-from typing import List, Dict, Optional, Tuple
+from operator import attrgetter
+from typing import FrozenSet, List, Dict, Optional, Tuple
 import bisect
 
 from variable import Variable, LinearVariable
 from registry import Registry
-from modifiers import get_modifier_registry, apply_rate_modifier, apply_consumed_modifier, apply_produced_modifier
+from modifiers import ModifierRegistry, get_modifier_registry, apply_rate_modifier, apply_consumed_modifier, apply_produced_modifier
+# upgrades only imports timeline inside a function, so this is not circular
+from upgrades import get_upgrade_registry
 
 import const
 
+# Sort key for the events list
+_event_time = attrgetter("t")
+
 class TimeState():
     registry: Registry = None
     processes: List[Optional["Process"]] = None  # These are things that modify rates while present, so we have to be careful to apply and undo their effects correctly
@@ -37,7 +44,11 @@ class TimeState():
 
         Uses a Variable named 'task_unlocked_<name>' to track unlock state.
         """
-        var = self.get_variable(f"task_unlocked_{task_name}")
+        return self.is_task_unlock_var_set(f"task_unlocked_{task_name}")
+
+    def is_task_unlock_var_set(self, var_name: str) -> bool:
+        """is_task_unlocked for callers that already hold the 'task_unlocked_<name>' variable name."""
+        var = self.get_variable(var_name)
         return var is not None and var.get(self.time) >= 1
 
     def is_resource_unlocked(self, resource_name: str) -> bool:
@@ -74,21 +85,21 @@ class TimeState():
 
     # Return a hard copy of the timestate, propagated forward to time t (for rehoming linearvariables)
     def copy(self, t):
-        new_state = deepcopy(self)
+        # Variables are cloned (and rehomed) field by field; only the process
+        # list, whose events reference each other, still needs a full deepcopy
+        new_state = TimeState.__new__(TimeState)
         new_state.time = t
-        new_state.registry.time = t
-
-        for key in self.registry.keys():
-            if type(new_state.registry[key]) is LinearVariable:
-                new_state.registry[key].rehome(t)
-
+        new_state.registry = self.registry.copy_at(t)
+        new_state.processes = deepcopy(self.processes)
         return new_state
     
 class Timeline():
     events: List[Optional["Event"]] = None
     state_cache: List[TimeState] = None
+    _state_times: array = None # Times of the state_cache entries, in the same order
     initial: TimeState = None # Initial timestate
     max_time: float = 0.0 # This should go with game time, but we need it for recomputes. Change this with a method though
+    version: int = 0 # Bumped whenever events or cached states change, so callers can cache derived data
 
     def __init__(self, initial):
         self.initial = initial
@@ -97,12 +108,51 @@ class Timeline():
 
     def clear_cache(self):
         self.state_cache = [self.initial]
+        # Times of state_cache entries, kept in step with it so lookups can
+        # bisect over plain doubles instead of calling a key function per probe
+        self._state_times = array('d', [self.initial.time])
+        self.version += 1
+
+    # Keep only the first n cached states
+    def _truncate_states(self, n):
+        del self.state_cache[n:]
+        del self._state_times[n:]
+
+    # Put an event into the sorted events list without triggering it. Events
+    # are mostly added at or after the last one, so append those directly
+    def _insert_event(self, event):
+        events = self.events
+        if not events or events[-1].t <= event.t:
+            events.append(event)
+        else:
+            bisect.insort(events, event, key=_event_time)
+
+    # Take an event out of the events list without recomputing. Returns False if it wasn't there
+    def _discard_event(self, event):
+        events = self.events
+        # Search only the run of events at the same time, then fall back to a
+        # full scan in case the event's time moved after it was inserted
+        i = bisect.bisect_left(events, event.t, key=_event_time)
+        while i < len(events) and events[i].t == event.t:
+            if events[i] is event:
+                del events[i]
+                return True
+            i += 1
+        for i, ev in enumerate(events):
+            if ev is event:
+                del events[i]
+                return True
+        return False
+
+    # Call after mutating a cached TimeState in place, outside of add_event/remove_event
+    def touch(self):
+        self.version += 1
 
     # Remove everything from the cache after but not including t
     # Also remove and recompute all events after t which have invalidate=True
     def invalidate_after(self, t):
-        self.state_cache = self.state_cache[:bisect.bisect_right(self.state_cache, t, key=lambda e: e.time)]
-        i = bisect.bisect_right(self.events, t, key=lambda e: e.t)
+        self._truncate_states(bisect.bisect_right(self._state_times, t))
+        i = bisect.bisect_right(self.events, t, key=_event_time)
 
         head_events = self.events[:i]
 
@@ -113,9 +163,10 @@ class Timeline():
 
         # Now recompute from this time
         self.recompute(t)
+        self.version += 1
 
     def next_event(self, t): # Returns (time, next event) or (max_time, None)
-        idx = bisect.bisect_right(self.events, t, key=lambda e: e.t)
+        idx = bisect.bisect_right(self.events, t, key=_event_time)
 
         if idx < len(self.events):
             ev = self.events[idx]
@@ -132,6 +183,7 @@ class Timeline():
         else:
             self.max_time = new_max
             self.invalidate_after(new_max)
+        self.version += 1
 
     def recompute_bottlenecks(self, ts: TimeState):
         """Review all running processes and update their end events.
@@ -260,14 +312,14 @@ class Timeline():
                 # the next known event.
                 if next_bottleneck is not None and next_btime < next_time:
                     # Add the bottleneck event to the events list so it shows on timeline
-                    bisect.insort(self.events, next_bottleneck, key=lambda e: e.t)
+                    self._insert_event(next_bottleneck)
                     # Only trigger if the event is within max_time
                     if next_btime <= self.max_time:
                         # Trigger the bottleneck event (process end, task complete, etc.)
                         triggered = next_bottleneck.trigger(next_btime, self)
                         if not triggered:
                             # Validation failed, remove the event
-                            self.events.remove(next_bottleneck)
+                            self._discard_event(next_bottleneck)
                         else:
                             cur_time = next_btime
                             ts = self.state_at(cur_time)
@@ -289,34 +341,37 @@ class Timeline():
                     break
 
     def state_at(self, t): # Return the last TimeState from just before or equal to t from the state cache
-        idx = bisect.bisect_right(self.state_cache, t, key=lambda e: e.time)-1
+        idx = bisect.bisect_right(self._state_times, t)-1
         return self.state_cache[idx]
 
     def add_timestate(self, timestate: TimeState):
-        bisect.insort(self.state_cache, timestate, key=lambda e: e.time)
+        idx = bisect.bisect_right(self._state_times, timestate.time)
+        self.state_cache.insert(idx, timestate)
+        self._state_times.insert(idx, timestate.time)
 
     # Note - this will call add_timestate to add a timestate to the cache
     def add_event(self, event):
-        bisect.insort(self.events, event, key=lambda e: e.t)
+        self._insert_event(event)
         event.trigger(event.t, self)
         self.invalidate_after(event.t)
+        self.version += 1
 
     # Remove an event from the timeline and invalidate/recompute
     def remove_event(self, event):
-        if event in self.events:
+        if self._discard_event(event):
             t = event.t
-            self.events.remove(event)
             # Clear states at AND after the event time (unlike invalidate_after which keeps states at t)
             # Always keep at least the initial state (index 0) to prevent empty cache
-            self.state_cache = self.state_cache[:max(1, bisect.bisect_left(self.state_cache, t, key=lambda e: e.time))]
+            self._truncate_states(max(1, bisect.bisect_left(self._state_times, t)))
             # Process remaining events - keep those without invalidate flag
-            i = bisect.bisect_right(self.events, t, key=lambda e: e.t)
+            i = bisect.bisect_right(self.events, t, key=_event_time)
             head_events = self.events[:i]
             for j in range(i, len(self.events)):
                 if not self.events[j].invalidate:
                     head_events.append(self.events[j])
             self.events = head_events
             self.recompute(t)
+            self.version += 1
 
 class Event():
     t: float = 0.0 # Time of this event
@@ -370,7 +425,7 @@ class Process(Event):
     produced: List[Tuple[str, float]] = None  # List of (variable_name, rate) pairs
     throttle: float = 1.0  # What fraction of the maximum rate does this process operate at?
     end_event: Optional["ProcessEnd"] = None  # Reference to the end event
-    tags: List[str] = None  # Category tags for modifier targeting
+    tags: FrozenSet[str] = None  # Category tags for modifier targeting
 
     def __init__(self, name, displayname=None, consumed=None, produced=None, tags=None):
         super().__init__(name, displayname)
@@ -378,17 +433,19 @@ class Process(Event):
         self.base_produced = produced or []
         self.consumed = list(self.base_consumed)  # Working copy (may be modified)
         self.produced = list(self.base_produced)
-        self.tags = tags or []
+        # A frozenset makes modifier tag matching a hash lookup and lets the
+        # modifier cache use it as a key without conversion
+        self.tags = frozenset(tags) if tags else frozenset()
         self.end_event = None
         self.invalidate = True  # Processes can be invalidated if prerequisites change
 
-    def get_modified_consumed(self) -> List[Tuple[str, float]]:
+    def get_modified_consumed(self, registry: Optional[ModifierRegistry] = None) -> List[Tuple[str, float]]:
         """Get consumed rates with modifiers applied."""
-        return apply_consumed_modifier(self.base_consumed, self.tags)
+        return apply_consumed_modifier(self.base_consumed, self.tags, registry)
 
-    def get_modified_produced(self) -> List[Tuple[str, float]]:
+    def get_modified_produced(self, registry: Optional[ModifierRegistry] = None) -> List[Tuple[str, float]]:
         """Get produced rates with modifiers applied."""
-        return apply_produced_modifier(self.base_produced, self.tags)
+        return apply_produced_modifier(self.base_produced, self.tags, registry)
 
     def validate(self, timestate: TimeState, t: float) -> bool:
         """Check if process can start - ensure uniqueness and resource availability."""
@@ -412,8 +469,9 @@ class Process(Event):
     def on_start_vars(self, timestate: TimeState):
         """Modify variable rates when process starts."""
         # Apply modifiers to get effective rates
-        effective_consumed = self.get_modified_consumed()
-        effective_produced = self.get_modified_produced()
+        registry = get_modifier_registry()
+        effective_consumed = self.get_modified_consumed(registry)
+        effective_produced = self.get_modified_produced(registry)
 
         # Store effective values for use in ProcessEnd
         self.consumed = effective_consumed
@@ -464,10 +522,9 @@ class Process(Event):
         """Cancel this process at time t (player-initiated stop)."""
         if self.end_event:
             # Move the end event to now
-            timeline.events.remove(self.end_event)
+            timeline._discard_event(self.end_event)
         self.end_event = ProcessEnd(self, t, is_action=True)
-        import bisect
-        bisect.insort(timeline.events, self.end_event, key=lambda e: e.t)
+        timeline._insert_event(self.end_event)
         timeline.invalidate_after(t)
 
 
@@ -528,9 +585,9 @@ class Task(Process):
         self.rate = rate  # Will be modified when triggered
         self.progress_var = None
 
-    def get_modified_rate(self) -> float:
+    def get_modified_rate(self, registry: Optional[ModifierRegistry] = None) -> float:
         """Get the task rate with modifiers applied."""
-        return apply_rate_modifier(self.base_rate, self.tags)
+        return apply_rate_modifier(self.base_rate, self.tags, registry)
 
     def validate(self, timestate: TimeState, t: float) -> bool:
         """Check if task can start - also check that task isn't already running."""
@@ -646,11 +703,7 @@ class TaskComplete(Event):
     def on_start_effects(self, timeline: Timeline):
         """Apply task-specific follow-up effects."""
         # Notify upgrade registry of task completion (for prerequisites)
-        try:
-            from upgrades import get_upgrade_registry
-            get_upgrade_registry().mark_task_completed(self.task.name)
-        except ImportError:
-            pass  # Upgrade system not available
+        get_upgrade_registry().mark_task_completed(self.task.name)
 
         self.task.on_finish_effects(timeline)
 
@@ -115,6 +115,7 @@ class TimelinePanel(ttk.Frame):
         self.view_duration = max(10, self.view_duration * 0.7)
         self.view_start = center - self.view_duration / 2
         self._clamp_view()
+        self.app.mark_dirty()
 
     def _zoom_out(self):
         """Zoom out on the timeline."""
@@ -122,6 +123,7 @@ class TimelinePanel(ttk.Frame):
         self.view_duration = min(1000, self.view_duration * 1.4)
         self.view_start = center - self.view_duration / 2
         self._clamp_view()
+        self.app.mark_dirty()
 
     def _clamp_view(self):
         """Ensure view stays within valid bounds."""
@@ -161,7 +163,7 @@ class TimelinePanel(ttk.Frame):
 
     def _on_resize(self, event):
         """Handle canvas resize."""
-        pass  # Will be redrawn on next update
+        self.app.mark_dirty()  # Redrawn on next update
 
     def update_display(self, current_time: float):
         """Update the timeline display."""
@@ -527,10 +529,13 @@ class TimelinePanel(ttk.Frame):
         if hovered != self.hovered_event:
             self.hovered_event = hovered
             self._update_popup(event)
+            self.app.mark_dirty()  # Redraw hover highlight
 
     def _on_leave(self, event):
         """Handle mouse leaving the canvas."""
-        self.hovered_event = None
+        if self.hovered_event is not None:
+            self.hovered_event = None
+            self.app.mark_dirty()
         self._hide_popup()
 
     def _update_popup(self, event):
@@ -622,6 +627,7 @@ class TimelinePanel(ttk.Frame):
         """Delete a player-created event from the timeline."""
         self._hide_popup()
         self.gamestate.timeline.remove_event(event)
+        self.app.mark_dirty()
 
     def _clear_future_events(self):
         """Clear all player-created future events from the current time."""
@@ -638,3 +644,4 @@ class TimelinePanel(ttk.Frame):
         # Remove them (in reverse order to avoid index issues)
         for event in reversed(events_to_remove):
             self.gamestate.timeline.remove_event(event)
+        self.app.mark_dirty()
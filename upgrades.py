@@ -11,10 +11,10 @@
 # - Effects (modifiers, unlocks, etc.)
 # - Visibility rules (shown only when prereqs met)
 
-from typing import Dict, List, Optional, Any, Tuple, Callable, Set
+import sys
+from typing import Dict, List, Optional, Any, Tuple, Callable, Set, Iterable
 from dataclasses import dataclass, field
 from enum import Enum
-from copy import deepcopy
 
 from modifiers import Modifier, get_modifier_registry
 
@@ -91,7 +91,7 @@ class UpgradeEffect:
     params: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UpgradeDefinition:
     """Complete definition of an upgrade.
 
@@ -105,7 +105,12 @@ class UpgradeDefinition:
         effects: List of effects when purchased
         render_position: For research tree, (x, y) position in the graph
         icon: Optional icon identifier
-        purchased: Whether this upgrade has been bought
+        tags: Tags for this upgrade itself
+        prereq_upgrade_names: Targets of the UPGRADE/RESEARCH prerequisites, i.e. the
+            tree edges into this upgrade. Derived on construction
+        costs_tuple: costs as (resource, amount) pairs. Derived on construction
+        costs_display: costs as "amount resource" text, comma separated. Derived
+            on construction
     """
     name: str
     displayname: str
@@ -117,6 +122,20 @@ class UpgradeDefinition:
     render_position: Tuple[float, float] = (0, 0)  # For research tree layout
     icon: str = ""
     tags: List[str] = field(default_factory=list)  # Tags for this upgrade itself
+    prereq_upgrade_names: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    costs_tuple: Tuple[Tuple[str, float], ...] = field(init=False, repr=False, compare=False)
+    costs_display: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Frozen, so derived fields are set through object.__setattr__
+        object.__setattr__(self, "prereq_upgrade_names", tuple(
+            p.target for p in self.prerequisites
+            if p.prereq_type in (PrerequisiteType.UPGRADE, PrerequisiteType.RESEARCH)
+        ))
+        object.__setattr__(self, "costs_tuple",
+                           tuple((sys.intern(c.resource), c.amount) for c in self.costs))
+        object.__setattr__(self, "costs_display",
+                           ", ".join(f"{amount} {resource}" for resource, amount in self.costs_tuple))
 
 
 class UpgradeRegistry:
@@ -131,6 +150,12 @@ class UpgradeRegistry:
 
     def __init__(self):
         self._upgrades: Dict[str, UpgradeDefinition] = {}
+        # Registered upgrades bucketed by type, in registration order
+        self._by_type: Dict[UpgradeType, List[UpgradeDefinition]] = {}
+        # Reverse prerequisite edges: upgrade name -> names of the upgrades
+        # that need it purchased. Buying an upgrade can only change the
+        # visibility of itself and these.
+        self._dependents: Dict[str, List[str]] = {}
         self._purchased: Set[str] = set()
         self._unlocked_tasks: Set[str] = set()
         self._unlocked_resources: Set[str] = set()
@@ -139,12 +164,33 @@ class UpgradeRegistry:
         # Nexus-specific values
         self._max_time_multiplier: float = 1.0
         self._max_parallel_tasks: int = 1
+        # Bumped whenever registrations, purchases, unlocks or completions
+        # change, so callers can cache data derived from this registry
+        self.version: int = 0
+        # Non-time-aware visibility, rebuilt when stale and patched in place
+        # by purchase()
+        self._visible: Dict[str, bool] = {}
+        self._visible_version: int = -1
 
     def register(self, upgrade: UpgradeDefinition):
         """Register an upgrade definition."""
+        old = self._upgrades.get(upgrade.name)
         self._upgrades[upgrade.name] = upgrade
+        if old is not None:
+            for target in old.prereq_upgrade_names:
+                self._dependents[target].remove(old.name)
+        for target in upgrade.prereq_upgrade_names:
+            self._dependents.setdefault(target, []).append(upgrade.name)
+        bucket = self._by_type.setdefault(upgrade.upgrade_type, [])
+        if old is not None and old.upgrade_type == upgrade.upgrade_type:
+            bucket[bucket.index(old)] = upgrade
+        else:
+            if old is not None:
+                self._by_type[old.upgrade_type].remove(old)
+            bucket.append(upgrade)
+        self.version += 1
 
-    def register_all(self, upgrades: List[UpgradeDefinition]):
+    def register_all(self, upgrades: Iterable[UpgradeDefinition]):
         """Register multiple upgrade definitions."""
         for upgrade in upgrades:
             self.register(upgrade)
@@ -158,8 +204,11 @@ class UpgradeRegistry:
         return list(self._upgrades.values())
 
     def get_by_type(self, upgrade_type: UpgradeType) -> List[UpgradeDefinition]:
-        """Get all upgrades of a specific type."""
-        return [u for u in self._upgrades.values() if u.upgrade_type == upgrade_type]
+        """Get all upgrades of a specific type.
+
+        Returns the registry's own bucket, which callers must not modify.
+        """
+        return self._by_type.get(upgrade_type, [])
 
     def is_purchased(self, name: str) -> bool:
         """Check if an upgrade has been purchased."""
@@ -265,20 +314,56 @@ class UpgradeRegistry:
 
         Uses time-aware checking if timestate is provided.
         """
-        upgrade = self.get(name)
-        if not upgrade:
+        if timestate is None:
+            return self._get_global_visibility().get(name, False)
+
+        if not self.get(name):
             return False
 
         # Already purchased = visible (time-aware)
-        if timestate is not None:
-            if timestate.is_upgrade_purchased(name):
-                return True
-        elif self.is_purchased(name):
+        if timestate.is_upgrade_purchased(name):
             return True
 
-        # Check prerequisites (time-aware if timestate provided)
+        # Check prerequisites (time-aware)
         return self.check_prerequisites(name, timestate)
 
+    def _compute_visible(self, name: str) -> bool:
+        """Non-time-aware is_visible, bypassing the cache."""
+        return self.is_purchased(name) or self.check_prerequisites(name)
+
+    def _get_global_visibility(self) -> Dict[str, bool]:
+        """Get the cached non-time-aware visibility map, rebuilding it if stale."""
+        if self._visible_version != self.version:
+            self._visible = {name: self._compute_visible(name) for name in self._upgrades}
+            self._visible_version = self.version
+        return self._visible
+
+    def _update_visibility_after_purchase(self, upgrade: UpgradeDefinition):
+        """Patch the cached visibility map after upgrade was purchased.
+
+        Only the upgrade and its dependents are re-evaluated. Unlocking a
+        resource can satisfy prerequisites anywhere, so those purchases
+        leave the map stale for a full rebuild instead.
+        """
+        if any(e.effect_type == "unlock_resource" for e in upgrade.effects):
+            return
+        visible = self._visible
+        visible[upgrade.name] = True
+        for dependent in self._dependents.get(upgrade.name, ()):
+            visible[dependent] = self._compute_visible(dependent)
+        self._visible_version = self.version
+
+    def get_visibility_map(self, timestate=None) -> Dict[str, bool]:
+        """Map every registered upgrade name to is_visible(name, timestate).
+
+        Lets screens that check many upgrades (and their prerequisites)
+        evaluate each upgrade once per refresh. Without a timestate the
+        registry's cached map is returned; callers must not modify it.
+        """
+        if timestate is None:
+            return self._get_global_visibility()
+        return {name: self.is_visible(name, timestate) for name in self._upgrades}
+
     def get_visible_upgrades(self, upgrade_type: UpgradeType, timestate=None) -> List[UpgradeDefinition]:
         """Get all visible upgrades of a type."""
         return [
@@ -301,17 +386,18 @@ class UpgradeRegistry:
             return False
 
         upgrade = self.get(name)
+        visibility_current = self._visible_version == self.version
 
         # Deduct costs
         for cost in upgrade.costs:
             var = timestate.get_variable(cost.resource)
             if var:
-                from variable import LinearVariable
                 current = var.get(t)
                 var.set(current - cost.amount, t)
 
         # Mark as purchased in global registry (for compatibility)
         self._purchased.add(name)
+        self.version += 1
 
         # Mark as purchased in timestate (for time-aware queries)
         timestate.add_purchased_upgrade(name)
@@ -319,6 +405,9 @@ class UpgradeRegistry:
         # Apply effects
         self._apply_effects(upgrade, timestate, t)
 
+        if visibility_current:
+            self._update_visibility_after_purchase(upgrade)
+
         return True
 
     def _apply_effects(self, upgrade: UpgradeDefinition, timestate, t: float):
@@ -367,7 +456,6 @@ class UpgradeRegistry:
                 value = effect.params.get("value", 0)
                 var = timestate.get_variable(var_name)
                 if var:
-                    from variable import LinearVariable
                     current = var.get(t)
                     var.set(current + value, t)
 
@@ -381,13 +469,23 @@ class UpgradeRegistry:
 
     def mark_task_completed(self, task_name: str):
         """Mark a task as completed (for prerequisite checking)."""
-        self._completed_tasks.add(task_name)
+        if task_name not in self._completed_tasks:
+            self._completed_tasks.add(task_name)
+            self.version += 1
 
     def is_task_unlocked(self, task_name: str) -> bool:
         """Check if a task is unlocked (visible to the player)."""
         # A task is unlocked if it was explicitly unlocked OR if it has no unlock requirement
         return task_name in self._unlocked_tasks
 
+    def get_unlocked_tasks(self) -> Set[str]:
+        """Get the names of tasks unlocked by upgrades.
+
+        Returns the registry's own set, which is kept up to date as effects
+        apply; callers must not modify it.
+        """
+        return self._unlocked_tasks
+
     def is_resource_unlocked(self, resource_name: str) -> bool:
         """Check if a resource is unlocked (visible to the player)."""
         return resource_name in self._unlocked_resources
@@ -407,14 +505,7 @@ class UpgradeRegistry:
             List of (upgrade, [prereq_names]) tuples for drawing the tree
         """
         research = self.get_by_type(UpgradeType.RESEARCH)
-        result = []
-        for upgrade in research:
-            prereq_names = [
-                p.target for p in upgrade.prerequisites
-                if p.prereq_type in (PrerequisiteType.UPGRADE, PrerequisiteType.RESEARCH)
-            ]
-            result.append((upgrade, prereq_names))
-        return result
+        return [(upgrade, list(upgrade.prereq_upgrade_names)) for upgrade in research]
 
     def get_purchase_state(self) -> Dict[str, bool]:
         """Get a dictionary of all upgrade names to their purchase state."""
@@ -423,6 +514,7 @@ class UpgradeRegistry:
     def load_purchase_state(self, state: Dict[str, bool]):
         """Load purchase state from saved data."""
         self._purchased = {name for name, purchased in state.items() if purchased}
+        self.version += 1
 
     def reset(self):
         """Reset all purchase state (for new game)."""
@@ -432,6 +524,7 @@ class UpgradeRegistry:
         self._completed_tasks.clear()
         self._max_time_multiplier = 1.0
         self._max_parallel_tasks = 1
+        self.version += 1
         get_modifier_registry().clear()
 
     def reset_non_nexus(self):
@@ -457,6 +550,7 @@ class UpgradeRegistry:
         self._unlocked_tasks.clear()
         self._unlocked_resources.clear()
         self._completed_tasks.clear()
+        self.version += 1
 
         for name in self._purchased:
             upgrade = self.get(name)
@@ -538,6 +632,16 @@ def create_purchase_event(upgrade_name: str, t: float):
 # Helper functions for creating upgrade definitions
 # =============================================================================
 
+# Prerequisite type strings accepted by make_upgrade
+_PREREQ_TYPES: Dict[str, PrerequisiteType] = {
+    "upgrade": PrerequisiteType.UPGRADE,
+    "research": PrerequisiteType.RESEARCH,
+    "resource": PrerequisiteType.RESOURCE,
+    "variable": PrerequisiteType.VARIABLE,
+    "task": PrerequisiteType.TASK,
+}
+
+
 def make_upgrade(
     name: str,
     displayname: str,
@@ -568,18 +672,10 @@ def make_upgrade(
     Returns:
         A fully constructed UpgradeDefinition
     """
-    prereq_type_map = {
-        "upgrade": PrerequisiteType.UPGRADE,
-        "research": PrerequisiteType.RESEARCH,
-        "resource": PrerequisiteType.RESOURCE,
-        "variable": PrerequisiteType.VARIABLE,
-        "task": PrerequisiteType.TASK,
-    }
-
     prereqs = []
     if prerequisites:
         for type_str, target, value in prerequisites:
-            prereq_type = prereq_type_map.get(type_str, PrerequisiteType.UPGRADE)
+            prereq_type = _PREREQ_TYPES.get(type_str, PrerequisiteType.UPGRADE)
             prereqs.append(Prerequisite(prereq_type, target, value))
 
     cost_list = []
@@ -132,11 +132,15 @@ class UpgradesScreen(ttk.Frame):
         self.upgrades_list.delete(0, tk.END)
 
         registry = get_upgrade_registry()
+        # Purchased upgrades are always visible, so one map covers both checks
+        visible = registry.get_visibility_map()
+        is_purchased = registry.is_purchased
+        insert = self.upgrades_list.insert
         for upgrade in REGULAR_UPGRADES:
             # Show if visible (prerequisites met) or already purchased
-            if registry.is_visible(upgrade.name) or registry.is_purchased(upgrade.name):
-                prefix = "[OK] " if registry.is_purchased(upgrade.name) else ""
-                self.upgrades_list.insert(tk.END, f"{prefix}{upgrade.displayname}")
+            if visible.get(upgrade.name, False):
+                prefix = "[OK] " if is_purchased(upgrade.name) else ""
+                insert(tk.END, f"{prefix}{upgrade.displayname}")
 
     def _on_select(self, event):
         """Handle upgrade selection."""
@@ -244,9 +248,12 @@ class UpgradesScreen(ttk.Frame):
         if registry.can_purchase(self.selected_upgrade.name, ts, current_time):
             success = registry.purchase(self.selected_upgrade.name, ts, current_time)
             if success:
+                # purchase() edits the cached state in place
+                self.gamestate.timeline.touch()
                 print(f"Purchased upgrade: {self.selected_upgrade.displayname}")
                 self._populate_upgrades_list()
                 self._update_details()
+                self.app.mark_dirty()
             else:
                 print(f"Failed to purchase: {self.selected_upgrade.displayname}")
         else:
@@ -418,11 +425,15 @@ class NexusScreen(ttk.Frame):
         self.upgrades_list.delete(0, tk.END)
 
         registry = get_upgrade_registry()
+        # Purchased upgrades are always visible, so one map covers both checks
+        visible = registry.get_visibility_map()
+        is_purchased = registry.is_purchased
+        insert = self.upgrades_list.insert
         for upgrade in self.nexus_upgrades:
             # Show if visible (prerequisites met) or already purchased
-            if registry.is_visible(upgrade.name) or registry.is_purchased(upgrade.name):
-                prefix = "[OK] " if registry.is_purchased(upgrade.name) else ""
-                self.upgrades_list.insert(tk.END, f"{prefix}{upgrade.displayname}")
+            if visible.get(upgrade.name, False):
+                prefix = "[OK] " if is_purchased(upgrade.name) else ""
+                insert(tk.END, f"{prefix}{upgrade.displayname}")
 
     def _on_select(self, event):
         """Handle upgrade selection."""
@@ -539,9 +550,12 @@ class NexusScreen(ttk.Frame):
         if registry.can_purchase(self.selected_upgrade.name, ts, current_time):
             success = registry.purchase(self.selected_upgrade.name, ts, current_time)
             if success:
+                # purchase() edits the cached state in place
+                self.gamestate.timeline.touch()
                 print(f"Purchased nexus upgrade: {self.selected_upgrade.displayname}")
                 self._populate_upgrades_list()
                 self._update_details()
+                self.app.mark_dirty()
             else:
                 print(f"Failed to purchase: {self.selected_upgrade.displayname}")
         else:
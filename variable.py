@@ -1,3 +1,4 @@
+import sys
 from typing import List, Dict, Optional
 
 
@@ -11,15 +12,18 @@ class Variable():
         tags: List of tags for categorization (e.g., ["resource", "basic"])
         unlocked: Whether this variable is visible to the player
     """
-    value: float = 0.0
-    name: str = ""
-    displayname: str = ""
-    tags: List[str] = None
-    unlocked: bool = True  # Whether visible in UI (for unlock system)
+    # Every TimeState copy clones each variable, so keep instances dict-free
+    __slots__ = ("value", "name", "displayname", "tags", "unlocked")
+
+    value: float
+    name: str
+    displayname: str
+    tags: List[str]
+    unlocked: bool  # Whether visible in UI (for unlock system)
 
     def __init__(self, name: str, value: float = 0, displayname: Optional[str] = None,
                  tags: Optional[List[str]] = None, unlocked: bool = True):
-        self.name = name
+        self.name = sys.intern(name)  # Registry key; interned names compare by identity
         self.value = value
         self.tags = tags if tags is not None else []
         self.unlocked = unlocked
@@ -34,6 +38,24 @@ class Variable():
     def set(self, x: float, t: float):
         self.value = x
 
+    def clone(self) -> "Variable":
+        """Return an independent copy of this variable.
+
+        Used when copying TimeStates; much cheaper than deepcopy since every
+        field is a scalar apart from tags, which gets a fresh list.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.value = self.value
+        new.name = self.name
+        new.displayname = self.displayname
+        new.tags = list(self.tags)
+        new.unlocked = self.unlocked
+        return new
+
+    def clone_at(self, t: float) -> "Variable":
+        """Return a clone for a state at time t. Plain variables don't depend on time."""
+        return self.clone()
+
     def has_tag(self, tag: str) -> bool:
         """Check if this variable has a specific tag."""
         return tag in self.tags
@@ -64,16 +86,19 @@ class LinearVariable(Variable):
         min: Minimum value (clamped)
         max: Maximum value (clamped)
     """
-    t0: float = 0.0
-    rate: float = 0.0
-    min: float = 0.0
-    max: float = 10000
+    __slots__ = ("t0", "rate", "min", "max")
+
+    t0: float
+    rate: float
+    min: float
+    max: float
 
     def __init__(self, name: str, value: float = 0, displayname: Optional[str] = None,
                  min: float = 0, max: float = 10000, rate: float = 0,
                  tags: Optional[List[str]] = None, unlocked: bool = True):
         super().__init__(name, value, displayname, tags, unlocked)
 
+        self.t0 = 0.0
         self.min = min
         self.max = max
         self.rate = rate
@@ -96,6 +121,28 @@ class LinearVariable(Variable):
         self.value = x
         self.t0 = t
 
+    def clone(self) -> "LinearVariable":
+        # Spelled out rather than extending Variable.clone; this runs for every
+        # linear variable on every state copy
+        new = self.__class__.__new__(self.__class__)
+        new.value = self.value
+        new.t0 = self.t0
+        new.name = self.name
+        new.displayname = self.displayname
+        new.tags = list(self.tags)
+        new.unlocked = self.unlocked
+        new.rate = self.rate
+        new.min = self.min
+        new.max = self.max
+        return new
+
+    def clone_at(self, t: float) -> "LinearVariable":
+        """Return a clone rehomed to t, without a separate rehome pass."""
+        new = self.clone()
+        new.value = self.get(t)
+        new.t0 = t
+        return new
+
     def when(self, target):
         """Calculate when this variable will reach the target value.
 